@@ -0,0 +1,74 @@
+"""
+Rows per second of bulk_create() at several batch sizes.
+
+    python benchmarks/bulk_create.py [--rows 100000] [--batch-sizes 100,1000,10000]
+        [--executemany-batch-size 0]
+
+Runs against the IRIS server configured as in server.py, in a table it
+creates and drops.
+"""
+
+import argparse
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import server
+
+server.setup()
+
+from django.db import connection, models  # noqa: E402
+
+
+class Row(models.Model):
+    name = models.CharField(max_length=100)
+    number = models.IntegerField()
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    created = models.DateTimeField()
+
+    class Meta:
+        app_label = "benchmarks"
+        db_table = "django_iris_bench_bulk_create"
+
+
+def rows(count):
+    created = datetime(2024, 1, 1)
+    return [
+        Row(name="row %d" % n, number=n, amount=Decimal(n) / 100, created=created)
+        for n in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-sizes", default="100,1000,10000")
+    parser.add_argument(
+        "--executemany-batch-size",
+        type=int,
+        default=0,
+        help="EXECUTEMANY_BATCH_SIZE, 0 sends each bulk_create() batch at once",
+    )
+    args = parser.parse_args()
+    connection.executemany_batch_size = args.executemany_batch_size
+
+    objs = rows(args.rows)
+    fields = [field for field in Row._meta.concrete_fields if not field.primary_key]
+    # Larger batch sizes are capped to it
+    max_batch_size = connection.ops.bulk_batch_size(fields, objs)
+    print("%d rows, at most %d per batch" % (args.rows, max_batch_size))
+    with server.tables(Row):
+        for batch_size in [int(size) for size in args.batch_sizes.split(",")]:
+            start = time.perf_counter()
+            Row.objects.bulk_create(objs, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+            assert Row.objects.count() == args.rows
+            Row.objects.all().delete()
+            print(
+                "batch_size %6d  %8.2fs  %10.0f rows/s"
+                % (batch_size, elapsed, args.rows / elapsed)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Django set up for the benchmarks that run against an IRIS server, given by
+IRIS_HOST, IRIS_PORT, IRIS_NAMESPACE, IRIS_USERNAME and IRIS_PASSWORD.
+"""
+
+import contextlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+
+def setup(**options):
+    settings.configure(
+        DATABASES={
+            "default": {
+                "ENGINE": "django_iris",
+                "NAME": os.environ.get("IRIS_NAMESPACE", "USER"),
+                "USER": os.environ.get("IRIS_USERNAME", "_SYSTEM"),
+                "PASSWORD": os.environ.get("IRIS_PASSWORD", "SYS"),
+                "HOST": os.environ.get("IRIS_HOST", "localhost"),
+                "PORT": int(os.environ.get("IRIS_PORT", 1972)),
+                "OPTIONS": options,
+            },
+        },
+        INSTALLED_APPS=[],
+        USE_TZ=False,
+    )
+    django.setup()
+
+
+@contextlib.contextmanager
+def tables(*models):
+    """Create the tables of the models for the benchmark, drop them after."""
+    from django.db import connection
+
+    with connection.schema_editor() as editor:
+        for model in models:
+            editor.create_model(model)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model in models:
+                editor.delete_model(model)
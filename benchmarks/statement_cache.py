@@ -0,0 +1,65 @@
+"""
+Per-execute cost of translating %s placeholders to ?, with and without the
+statement cache of the connection.
+
+    python benchmarks/statement_cache.py [--number 200000] [--shapes 200]
+
+No database is needed, the translation happens before the driver is called.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import timeit
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from django_iris.cursor import CursorWrapper  # noqa: E402
+from django_iris.utils import LRUCache  # noqa: E402
+
+
+def statements(shapes):
+    """ORM-like statements, of `shapes` distinct texts."""
+    columns = ", ".join('"testapp_book"."c%d"' % n for n in range(12))
+    return [
+        (
+            'SELECT %s FROM "testapp_book" WHERE "testapp_book"."c%d" = %%s '
+            'AND "testapp_book"."id" IN (%s)'
+            % (columns, n, ", ".join(["%s"] * (n % 8 + 1))),
+            n % 8 + 2,
+        )
+        for n in range(shapes)
+    ]
+
+
+def per_call(cache_size, queries, number):
+    connection = types.SimpleNamespace(statement_cache=LRUCache(cache_size))
+    cursor = CursorWrapper(None, connection)
+    calls = itertools.cycle(queries)
+
+    def run():
+        cursor._replace_params(*next(calls))
+
+    return min(timeit.repeat(run, number=number, repeat=5)) / number, connection
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--shapes", type=int, default=200)
+    args = parser.parse_args()
+
+    queries = statements(args.shapes)
+    uncached, _ = per_call(0, queries, args.number)
+    cached, connection = per_call(512, queries, args.number)
+    print("statement shapes   %8d" % args.shapes)
+    print("without cache      %8.0f ns/execute" % (uncached * 1e9))
+    print("with cache         %8.0f ns/execute" % (cached * 1e9))
+    print("speedup            %8.1fx" % (uncached / cached))
+    print("cache stats        %s" % connection.statement_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
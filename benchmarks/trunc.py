@@ -0,0 +1,97 @@
+"""
+Grouped aggregation over Trunc() buckets, with the DATEADD/DATEDIFF
+arithmetic of the backend and with the TO_CHAR round trip it replaced.
+
+    python benchmarks/trunc.py [--rows 1000000] [--kinds hour,day,week,month]
+
+Runs against the IRIS server configured as in server.py, in a table it
+creates and drops.
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import server
+
+server.setup()
+
+from django.db import connection, models  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.db.models.functions import Trunc  # noqa: E402
+
+
+class Event(models.Model):
+    at = models.DateTimeField()
+
+    class Meta:
+        app_label = "benchmarks"
+        db_table = "django_iris_bench_trunc"
+
+
+def to_char_trunc_sql(kind, sql):
+    """The TO_CHAR truncation the backend used before."""
+    sql = f"CAST({sql} as TIMESTAMP)"
+    if kind == "week":
+        return (
+            "CAST(TO_CHAR(DATEADD(DAY, - ((DATEPART(WEEKDAY, %s) + 5) # 7 ), %s), "
+            "'YYYY-MM-DD 00:00:00') AS DATETIME)" % (sql, sql)
+        )
+    fields = ["year", "month", "day", "hour", "minute", "second"]
+    format = ("YYYY-", "MM", "-DD", " HH24:", "MI", ":SS")
+    format_def = ("0000-", "01", "-01", " 00:", "00", ":00")
+    i = fields.index(kind) + 1
+    return "CAST(TO_CHAR(%s, '%s') AS TIMESTAMP)" % (
+        sql,
+        "".join(format[:i] + format_def[i:]),
+    )
+
+
+def arithmetic(kind):
+    buckets = Event.objects.annotate(bucket=Trunc("at", kind)).values("bucket")
+    return len(buckets.annotate(count=Count("id")).order_by())
+
+
+def to_char(kind):
+    bucket = to_char_trunc_sql(kind, connection.ops.quote_name("at"))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT %s, COUNT(*) FROM %s GROUP BY %s"
+            % (bucket, connection.ops.quote_name(Event._meta.db_table), bucket)
+        )
+        return len(cursor.fetchall())
+
+
+def timed(function, kind):
+    start = time.perf_counter()
+    groups = function(kind)
+    return time.perf_counter() - start, groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--kinds", default="hour,day,week,month")
+    args = parser.parse_args()
+
+    with server.tables(Event):
+        # A row every 37 seconds, about 15 months for a million rows
+        start = datetime(2024, 1, 1)
+        Event.objects.bulk_create(
+            (Event(at=start + timedelta(seconds=37 * n)) for n in range(args.rows)),
+            batch_size=10000,
+        )
+        for kind in args.kinds.split(","):
+            # Warm up the statements before timing them
+            arithmetic(kind), to_char(kind)
+            new, new_groups = timed(arithmetic, kind)
+            old, old_groups = timed(to_char, kind)
+            print(
+                "%-6s %6d groups  DATEADD %7.2fs  TO_CHAR %7.2fs  %5.1fx"
+                % (kind, new_groups, new, old, old / new)
+            )
+            assert new_groups == old_groups, (new_groups, old_groups)
+
+
+if __name__ == "__main__":
+    main()
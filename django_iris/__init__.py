@@ -1,13 +1,21 @@
+import json
+
+from django.db import NotSupportedError
 from django.db.models.functions.math import Random, Ln, Log
 from django.db.models.functions.datetime import Now
 from django.db.models.expressions import Exists, Func, Value, Col, OrderBy
 from django.db.models.functions.text import Chr, ConcatPair, StrIndex
 from django.db.models.functions import Cast
 from django.db.models.fields import TextField, CharField
-from django.db.models.lookups import BuiltinLookup
+from django.db.models.lookups import BuiltinLookup, StartsWith
 from django.db.models.fields.json import (
+    ContainedBy,
+    DataContains,
+    HasKeyLookup,
     KeyTransform,
     KeyTransformExact,
+    KeyTransformIn,
+    KeyTransformNumericLookupMixin,
     compile_json_path,
 )
 
@@ -161,25 +169,162 @@ def orderby_as_intersystems(self, compiler, connection, **extra_context):
     return copy.as_sql(compiler, connection, **extra_context)
 
 
-@as_intersystems(KeyTransformExact)
-def json_KeyTransformExact_as_intersystems(self, compiler, connection):
-    return self.as_sql(compiler, connection)
+def json_table_value(lhs, json_path):
+    """
+    Scalar value at json_path of the JSON document in lhs, as a correlated
+    subquery over JSON_TABLE. The path can't be a parameter there, it's
+    inlined, and as a JSON serialized key it can't escape the literal.
+    """
+    json_path = json_path.replace("'", "''").replace("%", "%%")
+    return (
+        "(SELECT jt.val FROM JSON_TABLE(%s, '$' COLUMNS "
+        "(val VARCHAR(32768) PATH '%s')) jt)" % (lhs, json_path)
+    )
+
+
+def json_scalar_params(params):
+    """
+    JSON_TABLE returns strings unquoted, compare them to the string itself,
+    and other scalars to their JSON text.
+    """
+    result = []
+    for param in params:
+        try:
+            value = json.loads(param)
+        except (TypeError, ValueError):
+            value = None
+        result.append(value if isinstance(value, str) else param)
+    return result
+
+
+def condition_in_order_by(compiler, sql, params):
+    if compiler.in_get_order_by:
+        return "CASE WHEN %s THEN 1 ELSE 0 END" % (sql,), params
+    return sql, params
 
 
 @as_intersystems(KeyTransform)
 def json_KeyTransform_as_intersystems(self, compiler, connection):
-    # breakpoint()
-    # json_path = compile_json_path(key_transforms)
-    return f"{self.field.name}__{self.key_name}", []
+    lhs, params, key_transforms = self.preprocess_lhs(compiler, connection)
+    return json_table_value(lhs, compile_json_path(key_transforms)), tuple(params)
+
+
+@as_intersystems(KeyTransformExact)
+def json_KeyTransformExact_as_intersystems(self, compiler, connection):
+    if isinstance(self.rhs, KeyTransform):
+        sql, params = self.as_sql(compiler, connection)
+        return condition_in_order_by(compiler, sql, params)
+    lhs, lhs_params = self.process_lhs(compiler, connection)
+    rhs, rhs_params = self.process_rhs(compiler, connection)
+    if rhs_params == ["null"]:
+        # JSON null and a missing key are both NULL in JSON_TABLE
+        sql, params = "%s IS NULL" % lhs, tuple(lhs_params)
+    else:
+        sql = "%s = %s" % (lhs, rhs)
+        params = tuple(lhs_params) + tuple(json_scalar_params(rhs_params))
+    return condition_in_order_by(compiler, sql, params)
+
+
+@as_intersystems(KeyTransformIn)
+def json_KeyTransformIn_as_intersystems(self, compiler, connection):
+    _, lhs_params = self.process_lhs(compiler, connection)
+    sql, params = self.as_sql(compiler, connection)
+    lhs_count = len(lhs_params)
+    params = tuple(params[:lhs_count]) + tuple(
+        json_scalar_params(params[lhs_count:])
+    )
+    return condition_in_order_by(compiler, sql, params)
+
+
+@as_intersystems(KeyTransformNumericLookupMixin)
+def json_KeyTransformNumericLookup_as_intersystems(self, compiler, connection):
+    # JSON_TABLE values are strings, compared as numbers to numbers only
+    lhs, lhs_params = self.process_lhs(compiler, connection)
+    rhs, rhs_params = self.process_rhs(compiler, connection)
+    if rhs_params and all(
+        isinstance(param, (int, float)) and not isinstance(param, bool)
+        for param in rhs_params
+    ):
+        lhs = "CAST(%s AS DOUBLE)" % lhs
+    sql = "%s %s" % (lhs, self.get_rhs_op(connection, rhs))
+    params = tuple(lhs_params) + tuple(rhs_params)
+    return condition_in_order_by(compiler, sql, params)
+
+
+@as_intersystems(HasKeyLookup)
+def json_HasKeyLookup_as_intersystems(self, compiler, connection):
+    # Keys with a JSON null value are not found
+    sql_parts = []
+    params = []
+    for lhs_sql, lhs_params, json_path in self._as_sql_parts(compiler, connection):
+        sql_parts.append("%s IS NOT NULL" % json_table_value(lhs_sql, json_path))
+        params.extend(lhs_params)
+    return self._combine_sql_parts(sql_parts), tuple(params)
+
+
+@as_intersystems(DataContains)
+def json_DataContains_as_intersystems(self, compiler, connection):
+    if not isinstance(self.rhs, dict) or any(
+        isinstance(value, (dict, list)) for value in self.rhs.values()
+    ):
+        raise NotSupportedError(
+            "contains lookup on IRIS supports only a dict of scalar values."
+        )
+    if isinstance(self.lhs, KeyTransform):
+        lhs, lhs_params, key_transforms = self.lhs.preprocess_lhs(compiler, connection)
+        json_path = compile_json_path(key_transforms)
+    else:
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        json_path = "$"
+    if not self.rhs:
+        return "%s IS NOT NULL" % lhs, tuple(lhs_params)
+    sql_parts = []
+    params = []
+    for key, value in self.rhs.items():
+        value_sql = json_table_value(lhs, "%s.%s" % (json_path, json.dumps(key)))
+        params.extend(lhs_params)
+        if value is None:
+            sql_parts.append("%s IS NULL" % value_sql)
+        else:
+            sql_parts.append("%s = %%s" % value_sql)
+            params.append(value if isinstance(value, str) else json.dumps(value))
+    return "(%s)" % " AND ".join(sql_parts), tuple(params)
+
+
+@as_intersystems(ContainedBy)
+def json_ContainedBy_as_intersystems(self, compiler, connection):
+    raise NotSupportedError("contained_by lookup is not supported on IRIS.")
+
+
+@as_intersystems(StartsWith)
+def startswith_as_intersystems(self, compiler, connection):
+    # %STARTSWITH takes the prefix as is, it's a LIKE pattern only for
+    # expressions, compiled with pattern_ops
+    if not self.rhs_is_direct_value() or self.bilateral_transforms:
+        sql, params = self.as_sql(compiler, connection)
+        return condition_in_order_by(compiler, sql, params)
+    lhs_sql, params = self.process_lhs(compiler, connection)
+    if (
+        self.lookup_name == "istartswith"
+        and isinstance(self.rhs, str)
+        and self.rhs != self.rhs.rstrip()
+    ):
+        # %SQLUPPER() strips trailing blanks, "foo " would be the prefix
+        # " FOO" of "foobar". In a pattern the blanks are followed by '%'
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        params.extend(rhs_params)
+        sql = "%s %s" % (lhs_sql, connection.operators["icontains"] % rhs_sql)
+        return condition_in_order_by(compiler, sql, params)
+    rhs_sql, rhs_params = self.get_db_prep_lookup(self.rhs, connection)
+    params.extend(rhs_params)
+    sql = "%s %s" % (lhs_sql, self.get_rhs_op(connection, rhs_sql))
+    return condition_in_order_by(compiler, sql, params)
 
 
 @as_intersystems(BuiltinLookup)
 def BuiltinLookup_as_intersystems(self, compiler, connection):
     sql, params = self.as_sql(compiler, connection)
-    if compiler.in_get_order_by:
-        return "CASE WHEN %s THEN 1 ELSE 0 END" % (sql,), params
-    # if not compiler.in_get_select and not compiler.in_get_order_by:
-    return sql, params
+    return condition_in_order_by(compiler, sql, params)
 
 
 @as_intersystems(Cast)
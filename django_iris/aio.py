@@ -0,0 +1,103 @@
+import asyncio
+import functools
+import itertools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# (event loop, alias) -> asyncio.Semaphore limiting queries in flight
+_limiters = weakref.WeakKeyDictionary()
+
+
+def _get_limiter(alias):
+    loop = asyncio.get_running_loop()
+    per_loop = _limiters.setdefault(loop, {})
+    if alias not in per_loop:
+        options = connections.settings[alias].get("OPTIONS", {})
+        per_loop[alias] = asyncio.Semaphore(options.get("ASYNC_MAX_IN_FLIGHT", 16))
+    return per_loop[alias]
+
+
+class AsyncConnection:
+    """
+    Asyncio facade, that binds one database connection to a dedicated
+    single thread executor.
+
+    Everything submitted runs on that thread, so Django's thread-local
+    `connections[alias]` always resolves to the same connection, instead of
+    whatever thread `sync_to_async` picks. Queries in flight are limited per
+    event loop with OPTIONS["ASYNC_MAX_IN_FLIGHT"].
+
+        async with AsyncConnection() as conn:
+            book = await conn.get(Book.objects.filter(pk=1))
+            async for book in conn.iterator(Book.objects.all()):
+                ...
+    """
+
+    def __init__(self, alias=DEFAULT_DB_ALIAS):
+        self.alias = alias
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="django_iris_%s" % alias
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def run(self, func, *args, **kwargs):
+        """Call func(*args, **kwargs) on the connection thread."""
+        loop = asyncio.get_running_loop()
+        async with _get_limiter(self.alias):
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def get(self, queryset, *args, **kwargs):
+        return await self.run(queryset.get, *args, **kwargs)
+
+    async def count(self, queryset):
+        return await self.run(queryset.count)
+
+    async def fetch(self, queryset):
+        return await self.run(list, queryset)
+
+    async def execute(self, sql, params=None):
+        def execute():
+            with connections[self.alias].cursor() as cursor:
+                cursor.execute(sql, params)
+                if cursor.description is None:
+                    return cursor.rowcount
+                return cursor.fetchall()
+
+        return await self.run(execute)
+
+    async def iterator(self, queryset, chunk_size=2000):
+        """
+        Iterate over a queryset in chunks, the next chunk is fetched on the
+        connection thread while the current one is consumed.
+        """
+        iterator = await self.run(queryset.iterator, chunk_size=chunk_size)
+        fetch = functools.partial(
+            self.run, lambda: list(itertools.islice(iterator, chunk_size))
+        )
+        pending = asyncio.ensure_future(fetch())
+        try:
+            while True:
+                chunk = await pending
+                if not chunk:
+                    break
+                pending = asyncio.ensure_future(fetch())
+                for item in chunk:
+                    yield item
+        finally:
+            if not pending.done():
+                pending.cancel()
+            await self.run(getattr(iterator, "close", lambda: None))
+
+    async def close(self):
+        # connections[alias] has to be looked up on the connection thread
+        await self.run(lambda: connections[self.alias].close())
+        self._executor.shutdown(wait=False)
@@ -1,4 +1,4 @@
-from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.base.base import NO_DB_ALIAS, BaseDatabaseWrapper
 from django.db.backends.base.client import BaseDatabaseClient
 from django.db.backends.base.creation import BaseDatabaseCreation
 from django.core.exceptions import ImproperlyConfigured
@@ -6,13 +6,21 @@ from django.utils.asyncio import async_unsafe
 from django.utils.functional import cached_property
 from django.db.utils import DatabaseErrorWrapper
 
+import re
+import threading
+import time
+
 from .introspection import DatabaseIntrospection
 from .features import DatabaseFeatures
 from .schema import DatabaseSchemaEditor
 from .operations import DatabaseOperations
-from .cursor import CursorWrapper
+from .compiler import CompiledSQLCache
+from .cursor import CursorWrapper, StatementHandles
+from .instrumentation import QueryStats
 from .creation import DatabaseCreation
 from .validation import DatabaseValidation
+from .pool import ConnectionPool
+from .utils import LRUCache
 
 import intersystems_iris.dbapi._DBAPI as Database
 
@@ -59,29 +67,35 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         "UUIDField": "UNIQUEIDENTIFIER",
     }
 
+    # Case-insensitive lookups compare in %SQLUPPER collation, the default
+    # one of string indexes. lookup_cast() applies it to the column
     operators = {
         "exact": "= %s",
-        "iexact": "LIKE %s ESCAPE '\\'",
+        "iexact": "= %%%%SQLUPPER(%s)",
         "contains": "LIKE %s ESCAPE '\\'",
-        "icontains": "LIKE %s ESCAPE '\\'",
+        "icontains": "LIKE %%%%SQLUPPER(%s) ESCAPE '\\'",
         # 'regex': "%%%%MATCHES %s ESCAPE '\\'",
         # 'iregex': "%%%%MATCHES %s ESCAPE '\\'",
         "gt": "> %s",
         "gte": ">= %s",
         "lt": "< %s",
         "lte": "<= %s",
-        "startswith": "LIKE %s ESCAPE '\\'",
+        # The value is not a pattern here, see startswith_as_intersystems()
+        "startswith": "%%%%STARTSWITH %s",
         "endswith": "LIKE %s ESCAPE '\\'",
-        "istartswith": "LIKE %s ESCAPE '\\'",
-        "iendswith": "LIKE %s ESCAPE '\\'",
+        "istartswith": "%%%%STARTSWITH %%%%SQLUPPER(%s)",
+        "iendswith": "LIKE %%%%SQLUPPER(%s) ESCAPE '\\'",
     }
 
     pattern_esc = r"REPLACE(REPLACE(REPLACE({}, '\', '\\'), '%%', '\%%'), '_', '\_')"
+    # The left-hand side is %SQLUPPER(), which adds a leading blank. A pattern
+    # built from %SQLUPPER() would have it too, inside the pattern, so the
+    # right-hand side is UPPER() and a prefix gets the blank explicitly
     pattern_ops = {
         "contains": "LIKE '%%' || {} || '%%'",
         "icontains": "LIKE '%%' || UPPER({}) || '%%'",
         "startswith": "LIKE {} || '%%'",
-        "istartswith": "LIKE UPPER({}) || '%%'",
+        "istartswith": "LIKE ' ' || UPPER({}) || '%%'",
         "endswith": "LIKE '%%' || {}",
         "iendswith": "LIKE '%%' || UPPER({})",
     }
@@ -106,6 +120,47 @@ class DatabaseWrapper(BaseDatabaseWrapper):
 
     _disable_constraint_checking = False
 
+    # Between pre_migrate and post_migrate, deferred indexes are built once
+    # at the end of the run
+    _index_builds_after_migrate = False
+    # The plan of that migrate run, pre_migrate is sent once per app with it
+    _migrate_run = None
+    # The schema_cache() of the migrate run, schema-wide metadata is loaded
+    # once for all of its migrations
+    _migrate_schema_cache = None
+
+    # time.monotonic() of the last successful round trip to the server
+    _last_io = 0.0
+
+    _named_cursor_idx = 0
+
+    _connection_pools = {}
+    _connection_pools_lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        options = self.settings_dict["OPTIONS"]
+        # Translated %s -> ? statements, keyed by (query, params_count)
+        self.statement_cache = LRUCache(options.get("STATEMENT_CACHE_SIZE", 512))
+        # Seconds after a successful round trip, when is_usable skips the probe
+        self.health_check_window = options.get("HEALTH_CHECK_WINDOW", 0)
+        # Rows per driver fetch for chunked (QuerySet.iterator()) cursors
+        self.fetch_size = options.get("FETCH_SIZE", 2000)
+        # Rows sent to the driver per executemany() call, 0 sends all at once
+        self.executemany_batch_size = options.get("EXECUTEMANY_BATCH_SIZE", 1000)
+        # Idle driver cursors kept per statement for reuse, 0 disables it
+        self.statement_handles = StatementHandles(
+            options.get("PREPARED_STATEMENT_CACHE_SIZE", 0)
+        )
+        # Compile slice bounds as bound parameters instead of literals
+        self.parameterize_limits = options.get("PARAMETERIZE_LIMITS", False)
+        # Compiled SELECT statements by Query structure, 0 disables it
+        self.compiled_cache = CompiledSQLCache(
+            options.get("COMPILED_SQL_CACHE_SIZE", 0)
+        )
+        # Opt-in latency histograms and slow query log, None when disabled
+        self.query_stats = QueryStats.from_options(options.get("INSTRUMENTATION"))
+
     def get_connection_params(self):
         settings_dict = self.settings_dict
 
@@ -160,11 +215,70 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         conn_params["autoCommit"] = self.autocommit
         return conn_params
 
+    @property
+    def pool(self):
+        pool_options = self.settings_dict["OPTIONS"].get("POOL")
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+
+        if self.alias not in self._connection_pools:
+            if self.settings_dict["CONN_MAX_AGE"] != 0:
+                raise ImproperlyConfigured(
+                    "Pooling doesn't support persistent connections."
+                )
+            pool_options = pool_options if isinstance(pool_options, dict) else {}
+            conn_params = self.get_connection_params()
+            autocommit = self.settings_dict["AUTOCOMMIT"]
+
+            def connect():
+                return Database.connect(**conn_params)
+
+            def reset(connection):
+                connection.rollback()
+                connection.setAutoCommit(autocommit)
+
+            with self._connection_pools_lock:
+                if self.alias not in self._connection_pools:
+                    self._connection_pools[self.alias] = ConnectionPool(
+                        connect,
+                        reset=reset,
+                        min_size=pool_options.get("MIN_SIZE", 0),
+                        max_size=pool_options.get("MAX_SIZE", 10),
+                        max_lifetime=pool_options.get("MAX_LIFETIME", 3600.0),
+                        max_idle=pool_options.get("MAX_IDLE", 600.0),
+                        timeout=pool_options.get("TIMEOUT", 30.0),
+                    )
+
+        return self._connection_pools[self.alias]
+
+    def close_pool(self):
+        with self._connection_pools_lock:
+            pool = self._connection_pools.pop(self.alias, None)
+        if pool:
+            pool.close()
+
+    @cached_property
+    def iris_version(self):
+        with self.temporary_connection() as cursor:
+            cursor.execute("SELECT $ZVERSION")
+            version = cursor.fetchone()[0]
+        match = re.search(r"\b(\d{4})\.(\d+)(?:\.(\d+))?", version)
+        return tuple(int(part) for part in match.groups() if part) if match else ()
+
+    def get_database_version(self):
+        return self.iris_version
+
     def init_connection_state(self):
-        pass
+        self._last_io = time.monotonic()
 
     @async_unsafe
     def get_new_connection(self, conn_params):
+        self.statement_handles.clear()
+        pool = self.pool
+        if pool:
+            # If nothing else has opened the pool, open it now.
+            pool.open()
+            return pool.getconn()
         return Database.connect(**conn_params)
 
     def _close(self):
@@ -172,21 +286,49 @@ class DatabaseWrapper(BaseDatabaseWrapper):
             # Automatically rollbacks anyway
             # self.in_atomic_block = False
             # self.needs_rollback = False
+            self.statement_handles.clear()
+            if self.query_stats is not None:
+                self.query_stats.export()
             with self.wrap_database_errors:
+                pool = self.pool
+                if pool:
+                    self._disable_constraint_checking = False
+                    pool.putconn(self.connection)
+                    # Connection can no longer be used.
+                    self.connection = None
+                    return
                 return self.connection.close()
 
     @async_unsafe
     def create_cursor(self, name=None):
         cursor = self.connection.cursor()
-        return CursorWrapper(cursor)
+        if name and self.fetch_size:
+            # Named cursors stream their result, keep only one batch in memory
+            cursor.arraysize = self.fetch_size
+        return CursorWrapper(cursor, self, name)
+
+    def chunked_cursor(self):
+        self._named_cursor_idx += 1
+        return self._cursor(
+            name="_django_iris_curs_%d_%d"
+            % (threading.current_thread().ident, self._named_cursor_idx)
+        )
 
     def is_usable(self):
+        if (
+            self.health_check_window
+            and time.monotonic() - self._last_io < self.health_check_window
+        ):
+            return True
+        # The driver has no dedicated ping, a bare SELECT 1 on a raw cursor
+        # is the cheapest round trip
         try:
             with self.connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
         except:
             return False
         else:
+            self._last_io = time.monotonic()
             return True
 
     @cached_property
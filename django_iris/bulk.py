@@ -0,0 +1,99 @@
+from django.db import connections, transaction
+from django.db.models import QuerySet
+
+
+def _can_execute(queryset, objs, fields, connection):
+    """
+    Only plain values of the queryset's own table go through executemany(),
+    everything else is left to Django's CASE WHEN implementation.
+    """
+    if connection.vendor != "intersystems" or queryset.query.has_filters():
+        return False
+    concrete_model = queryset.model._meta.concrete_model
+    for field in fields:
+        if field.model._meta.concrete_model is not concrete_model:
+            return False
+        if hasattr(field, "get_placeholder"):
+            return False
+        for obj in objs:
+            if hasattr(getattr(obj, field.attname), "resolve_expression"):
+                return False
+    return True
+
+
+def bulk_update(queryset, objs, fields, batch_size=None):
+    """
+    Same as QuerySet.bulk_update(), but sends one parameterised
+    `UPDATE t SET a = ?, b = ? WHERE id = ?` statement with the values of
+    every object through executemany(), within one transaction, instead of
+    compiling CASE WHEN expressions over each batch.
+
+    Expression values, filtered querysets and fields of parent models are
+    updated by Django's implementation. Returns the number of rows matched.
+    """
+    if batch_size is not None and batch_size <= 0:
+        raise ValueError("Batch size must be a positive integer.")
+    if not fields:
+        raise ValueError("Field names must be given to bulk_update().")
+    objs = tuple(objs)
+    if any(obj.pk is None for obj in objs):
+        raise ValueError("All bulk_update() objects must have a primary key set.")
+    field_names = fields
+    opts = queryset.model._meta
+    fields = [opts.get_field(name) for name in field_names]
+    if any(not f.concrete or f.many_to_many for f in fields):
+        raise ValueError("bulk_update() can only be used with concrete fields.")
+    if any(f.primary_key for f in fields):
+        raise ValueError("bulk_update() cannot be used with primary key fields.")
+    if not objs:
+        return 0
+
+    queryset = queryset.all()
+    queryset._for_write = True
+    connection = connections[queryset.db]
+    if not _can_execute(queryset, objs, fields, connection):
+        return QuerySet.bulk_update(queryset, objs, field_names, batch_size)
+    for obj in objs:
+        obj._prepare_related_fields_for_save(
+            operation_name="bulk_update", fields=fields
+        )
+
+    qn = connection.ops.quote_name
+    pk = opts.pk
+    sql = "UPDATE %s%s SET %s WHERE %s = %%s" % (
+        "%%NOCHECK " if connection._disable_constraint_checking else "",
+        qn(opts.db_table),
+        ", ".join("%s = %%s" % qn(field.column) for field in fields),
+        qn(pk.column),
+    )
+    batch_size = batch_size or connection.executemany_batch_size or len(objs)
+    rows_updated = 0
+    with transaction.atomic(using=queryset.db, savepoint=False):
+        with connection.cursor() as cursor:
+            for start in range(0, len(objs), batch_size):
+                param_rows = [
+                    [
+                        field.get_db_prep_save(getattr(obj, field.attname), connection)
+                        for field in fields
+                    ]
+                    + [pk.get_db_prep_value(obj.pk, connection)]
+                    for obj in objs[start : start + batch_size]
+                ]
+                cursor.executemany(sql, param_rows)
+                rows_updated += cursor.rowcount
+    return rows_updated
+
+
+class BulkUpdateQuerySetMixin:
+    """
+    Use with a model's manager, to make QuerySet.bulk_update() go through
+    bulk_update() above.
+
+        class BookQuerySet(BulkUpdateQuerySetMixin, models.QuerySet):
+            pass
+
+        objects = BookQuerySet.as_manager()
+    """
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        return bulk_update(self, objs, fields, batch_size)
@@ -1,65 +1,105 @@
 import itertools
+import json
+import re
 
 from django.core.exceptions import EmptyResultSet, FullResultSet
-from django.db.models.expressions import RawSQL
-from django.db.models.sql.where import AND
+from django.db import DatabaseError
+from django.db.models.constants import OnConflict
 from django.db.models.sql import compiler
-from django.db.models.fields.json import KeyTransform
-from django.db.models.expressions import DatabaseDefault
+from django.db.models.expressions import DatabaseDefault, Subquery
+from django.db.models.sql.query import Query
+from django.utils.hashable import make_hashable
+
+from .explain import parse_plans
+from .utils import LRUCache
 
 
 class Flag:
-    value = False
+    """
+    Set while inside a `with` block, nested blocks keep it set.
+    """
 
-    def __init__(self, value):
-        self.value = value
+    def __init__(self, value=False):
+        self.depth = 1 if value else 0
 
     def __enter__(self):
-        self.value = True
+        self.depth += 1
         return True
 
     def __exit__(self, *args):
-        self.value = False
+        self.depth -= 1
 
     def __bool__(self):
-        return self.value
+        return self.depth > 0
+
+
+class CompiledSQLCache(LRUCache):
+    """
+    Compiled SELECT statements, keyed by the structure of the Query and the
+    compiled WHERE clause. Only the WHERE clause is compiled again on a hit,
+    as it carries the parameter values.
+    """
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        # Queries, that can't be cached, e.g. with subqueries in SELECT
+        self.uncacheable = 0
+        # Queries compiled twice, after the custom as_sql() failed
+        self.fallbacks = 0
+
+    def stats(self):
+        return {
+            **super().stats(),
+            "uncacheable": self.uncacheable,
+            "fallbacks": self.fallbacks,
+        }
+
+
+class Uncacheable(Exception):
+    pass
+
+
+def _expression_key(expression):
+    if expression is None or isinstance(expression, str):
+        return expression
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        # Query.identity does not cover filters, don't trust it
+        if isinstance(node, (Query, Subquery)):
+            raise Uncacheable
+        stack.extend(
+            source
+            for source in node.get_source_expressions()
+            if source is not None
+        )
+    return expression.identity
+
+
+def _split_params(params, w_params):
+    """
+    Return params before and after w_params, if they appear exactly once.
+    """
+    params = list(params)
+    size = len(w_params)
+    if not size:
+        return params, []
+    starts = [
+        index
+        for index in range(len(params) - size + 1)
+        if params[index : index + size] == list(w_params)
+    ]
+    if len(starts) != 1:
+        return None
+    return params[: starts[0]], params[starts[0] + size :]
 
 
 class SQLCompiler(compiler.SQLCompiler):
-    in_get_select = Flag(False)
-    in_get_order_by = Flag(False)
-#     def get_from_clause(self):
-#         result, params = super().get_from_clause()
-#         jsoncolumns = {}
-#         for column in self.query.select + tuple(
-#             [column for column in (col.lhs for col in self.query.where.children)]
-#         ):
-#             if isinstance(column, KeyTransform):
-#                 if column.field.name not in jsoncolumns:
-#                     jsoncolumns[column.field.name] = {}
-#                 jsoncolumns[column.field.name][
-#                     column.key_name
-#                 ] = f"{column.field.name}__{column.key_name}"
-#         []
-#         for field in jsoncolumns:
-#             self.query.where.add(RawSQL("%s is not null" % (field,), []), AND)
-#             cols = ", ".join(
-#                 [
-#                     f"{jsoncolumns[field][col_name]} VARCHAR PATH '$.{col_name}'"
-#                     for col_name in jsoncolumns[field]
-#                 ]
-#             )
-#             result.append(
-#                 f"""
-# , JSON_TABLE("{column.field.name}", '$' COLUMNS(
-# {cols}
-# ))
-# """
-#             )
-
-#         if "model_fields_nullablejsonmodel" in self.query.alias_map:
-#             breakpoint()
-#         return result, params
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Per instance, compilers run concurrently in threaded workers
+        self.in_get_select = Flag(False)
+        self.in_get_order_by = Flag(False)
 
     def get_select(self, with_col_aliases=False):
         with self.in_get_select:
@@ -69,13 +109,127 @@ class SQLCompiler(compiler.SQLCompiler):
         with self.in_get_order_by:
             return super().get_order_by()
 
+    def _template_key(self, with_limits, with_col_aliases):
+        query = self.query
+        if (
+            query.combinator
+            or query.select_for_update
+            or query.explain_info
+            or query.where.contains_aggregate
+            or query.where.contains_over_clause
+        ):
+            raise Uncacheable
+        group_by = query.group_by
+        if isinstance(group_by, tuple):
+            group_by = tuple(_expression_key(expr) for expr in group_by)
+        key = (
+            query.model,
+            with_limits,
+            with_col_aliases,
+            self.elide_empty,
+            query.subquery,
+            query.alias_prefix,
+            tuple(
+                (alias, join.identity, bool(query.alias_refcount[alias]))
+                for alias, join in query.alias_map.items()
+            ),
+            query.default_cols,
+            tuple(_expression_key(expr) for expr in query.select),
+            # alias() annotations are not selected but can be ordered by
+            tuple(
+                (alias, _expression_key(expr))
+                for alias, expr in query.annotations.items()
+            ),
+            tuple(query.annotation_select),
+            make_hashable(query.extra_select),
+            query.extra_tables,
+            query.values_select,
+            query.distinct,
+            query.distinct_fields,
+            tuple(_expression_key(expr) for expr in query.order_by),
+            query.extra_order_by,
+            query.default_ordering,
+            query.standard_ordering,
+            make_hashable(query.select_related),
+            query.max_depth,
+            (frozenset(query.deferred_loading[0]), query.deferred_loading[1]),
+            group_by,
+            query.low_mark,
+            query.high_mark,
+        )
+        hash(key)
+        return key
+
     def as_sql(self, with_limits=True, with_col_aliases=False):
+        cache = self.connection.compiled_cache
+        if not cache.maxsize:
+            return self._as_sql(with_limits, with_col_aliases)
+        if all(self.query.alias_refcount[a] == 0 for a in self.query.alias_map):
+            self.query.get_initial_alias()
+        try:
+            key = self._template_key(with_limits, with_col_aliases)
+            # WHERE is compiled every time, it carries the parameter values
+            try:
+                where, w_params = self.compile(self.query.where)
+            except FullResultSet:
+                where, w_params = "", []
+            key += (where,)
+        except (Uncacheable, EmptyResultSet, TypeError):
+            cache.uncacheable += 1
+            return self._as_sql(with_limits, with_col_aliases)
+
+        template = cache.get(key)
+        if template is not None:
+            sql, prefix, suffix, state = template
+            (
+                select,
+                self.klass_info,
+                self.annotation_col_map,
+                self.col_count,
+                self.has_extra_select,
+            ) = state
+            self.select = list(select)
+            self.where, self.having, self.qualify = self.query.where, None, None
+            return sql, (*prefix, *w_params, *suffix)
+
+        sql, params = self._as_sql(with_limits, with_col_aliases)
+        split = _split_params(params, w_params)
+        if split is None:
+            cache.uncacheable += 1
+        else:
+            state = (
+                tuple(self.select),
+                self.klass_info,
+                self.annotation_col_map,
+                self.col_count,
+                self.has_extra_select,
+            )
+            cache.set(key, (sql, tuple(split[0]), tuple(split[1]), state))
+        return sql, params
+
+    def _as_sql(self, with_limits=True, with_col_aliases=False):
         with_limit_offset = (with_limits or self.query.is_sliced) and (
             self.query.high_mark is not None or self.query.low_mark > 0
         )
         if self.query.select_for_update or not with_limit_offset:
             query, params = super().as_sql(with_limits, with_col_aliases)
             return query, params
+        if self.connection.features.supports_limit_offset:
+            if not self.connection.parameterize_limits:
+                query, params = super().as_sql(with_limits, with_col_aliases)
+                return query, params
+            query, params = super().as_sql(False, with_col_aliases)
+            limit, offset = self.connection.ops._get_limit_offset_params(
+                self.query.low_mark, self.query.high_mark
+            )
+            params = list(params)
+            if limit:
+                query += " LIMIT %s"
+                params.append(limit)
+            # OFFSET 0 too, so the first page shares the statement text
+            query += " OFFSET %s"
+            params.append(offset)
+            return query, tuple(params)
         try:
             extra_select, order_by, group_by = self.pre_sql_setup()
 
@@ -111,8 +265,15 @@ class SQLCompiler(compiler.SQLCompiler):
                 result += distinct_result
                 params += distinct_params
 
+            # Bound as parameters, one statement text serves every page
+            parameterize_limits = self.connection.parameterize_limits
+
             if not offset:
-                result.append("TOP %d" % limit)
+                if parameterize_limits:
+                    result.append("TOP %s")
+                    params.append(limit)
+                else:
+                    result.append("TOP %d" % limit)
 
             first_col = ""
             out_cols = []
@@ -174,15 +335,6 @@ class SQLCompiler(compiler.SQLCompiler):
                 result.append("HAVING %s" % having)
                 params.extend(h_params)
 
-            if self.query.explain_info:
-                result.insert(
-                    0,
-                    self.connection.ops.explain_query_prefix(
-                        self.query.explain_info.format,
-                        **self.query.explain_info.options,
-                    ),
-                )
-
             if order_by_result and not offset:
                 result.append(order_by_result)
 
@@ -220,22 +372,64 @@ class SQLCompiler(compiler.SQLCompiler):
                 query = "SELECT %s FROM (%s) subquery" % (
                     ", ".join(sub_selects),
                     query,
-                ), tuple(sub_params + params)
+                )
+                params = sub_params + params
 
             if offset:
-                query = (
-                    "SELECT * FROM (%s) WHERE row_number between %d AND %d ORDER BY row_number"
-                    % (
+                # An open-ended slice, qs[10:], has no upper bound
+                if limit is None:
+                    rows, bounds = "row_number >= %s", [offset]
+                else:
+                    rows, bounds = "row_number between %s AND %s", [offset, limit]
+                if parameterize_limits:
+                    query = "SELECT * FROM (%s) WHERE %s ORDER BY row_number" % (
+                        query,
+                        rows,
+                    )
+                    params += bounds
+                else:
+                    query = "SELECT * FROM (%s) WHERE %s ORDER BY row_number" % (
                         query,
-                        offset,
-                        limit,
+                        rows % tuple("%d" % bound for bound in bounds),
                     )
+            if self.query.explain_info:
+                # Outside of the ROW_NUMBER() wrapper, EXPLAIN has to come first
+                query = "%s %s" % (
+                    self.connection.ops.explain_query_prefix(
+                        self.query.explain_info.format,
+                        **self.query.explain_info.options,
+                    ),
+                    query,
                 )
             return query, tuple(params)
         except Exception:
+            self.connection.compiled_cache.fallbacks += 1
             query, params = super().as_sql(with_limits, with_col_aliases)
             return query, params
 
+    def explain_query(self):
+        # The XML plan, possibly split over several rows
+        xml = "".join(
+            str(row[0])
+            for rows in self.execute_sql()
+            for row in rows
+            if row and row[0] is not None
+        )
+        format_ = (self.query.explain_info.format or "XML").upper()
+        if format_ == "XML":
+            yield xml
+            return
+        plans = parse_plans(xml)
+        if format_ == "JSON":
+            yield json.dumps([plan.as_dict() for plan in plans])
+        else:
+            for plan in plans:
+                yield plan.text
+
+
+# SQLCODE -119, UNIQUE or PRIMARY KEY constraint failed uniqueness check
+_uniqueness_violation_re = re.compile(r"SQLCODE:?\s*<?-119\b")
+
 
 class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
 
@@ -264,7 +458,65 @@ class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
         result.append("(%s)" % ", ".join(qn(f.column) for f in fields))
         result.append("DEFAULT VALUES")
 
-        return [(" ".join(result), [])]
+        return [(" ".join(result), [])] * len(self.query.objs)
+
+    def execute_sql(self, returning_fields=None):
+        if returning_fields and len(self.query.objs) > 1:
+            return self._execute_returning(returning_fields)
+        if returning_fields:
+            return super().execute_sql(returning_fields)
+        self.returning_fields = returning_fields
+        if self.query.on_conflict == OnConflict.IGNORE:
+            return self._execute_ignoring()
+        # Rows come as single-row INSERTs, the same statement text is sent
+        # once, with the parameters of all its rows, through executemany()
+        with self.connection.cursor() as cursor:
+            for sql, group in itertools.groupby(self.as_sql(), key=lambda x: x[0]):
+                param_rows = [params for _, params in group]
+                if len(param_rows) == 1 or not param_rows[0]:
+                    for params in param_rows:
+                        cursor.execute(sql, params)
+                else:
+                    cursor.executemany(sql, param_rows)
+        return []
+
+    def _execute_ignoring(self):
+        """
+        IRIS has no INSERT that skips duplicates. Rows are inserted one by
+        one, and the ones failing a uniqueness check are skipped.
+        """
+        with self.connection.cursor() as cursor:
+            for sql, params in self.as_sql():
+                try:
+                    cursor.execute(sql, params)
+                except DatabaseError as exc:
+                    if not _uniqueness_violation_re.search(str(exc)):
+                        raise
+        return []
+
+    def _execute_returning(self, returning_fields):
+        """
+        The identity of every row, in the order of the objects. executemany()
+        reports only the last one, so rows are inserted one by one, on one
+        cursor, which keeps the statement prepared.
+        """
+        self.returning_fields = returning_fields
+        opts = self.query.get_meta()
+        rows = []
+        with self.connection.cursor() as cursor:
+            for sql, params in self.as_sql():
+                cursor.execute(sql, params)
+                rows.append(
+                    (
+                        self.connection.ops.last_insert_id(
+                            cursor, opts.db_table, opts.pk.column
+                        ),
+                    )
+                )
+        converters = self.get_converters([opts.pk.get_col(opts)])
+        if converters:
+            rows = list(self.apply_converters(rows, converters))
+        return rows
 
 
 class SQLDeleteCompiler(compiler.SQLDeleteCompiler, SQLCompiler):
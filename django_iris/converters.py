@@ -0,0 +1,134 @@
+"""
+Result converters, built once per selected column.
+
+The IRIS driver may return temporal values as logical integers or as
+strings. The wire type is picked from the first non-NULL value of a column
+and the matching decoder is then used for the whole result, with the
+settings it needs bound in advance. A value of another type picks the
+decoder again.
+"""
+from datetime import date, datetime, time
+from functools import partial
+
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+
+# $HOROLOG day 0 is 1840-12-31
+HOROLOG_ORDINAL = 672046
+# Offsets of the logical %PosixTime value
+POSIX_POSITIVE_OFFSET = 2**60
+POSIX_NEGATIVE_OFFSET = -(2**61 * 3)
+
+
+def _datetime_from_int(value):
+    if value > 0:
+        value -= POSIX_POSITIVE_OFFSET
+    else:
+        value -= POSIX_NEGATIVE_OFFSET
+    return datetime.fromtimestamp(value / 1000000)
+
+
+def _datetime_from_str(value):
+    return parse_datetime(value) if value != "" else value
+
+
+def _identity(value):
+    return value
+
+
+def _date_from_int(value):
+    return date.fromordinal(HOROLOG_ORDINAL + value)
+
+
+def _date_from_str(value):
+    result = parse_date(value)
+    if result is None:
+        try:
+            return _date_from_int(int(value))
+        except ValueError:
+            pass
+    return result
+
+
+def _date_from_any(value):
+    try:
+        return _date_from_int(int(value))
+    except Exception:
+        return parse_date(value)
+
+
+def _time_from_int(value):
+    return time(value // 3600 % 24, value // 60 % 60, value % 60)
+
+
+def _time_from_str(value):
+    result = parse_time(value)
+    if result is None:
+        try:
+            return _time_from_int(int(value))
+        except ValueError:
+            pass
+    return result
+
+
+def _time_from_any(value):
+    try:
+        return _time_from_int(int(value))
+    except Exception:
+        return parse_time(value)
+
+
+def _specialized(decoders, fallback, finish=None):
+    """
+    Build a converter, that looks the decoder up by the type of the value
+    only when it changes, which is once per column in practice.
+    """
+    wire_type = None
+    decode = None
+
+    def converter(value, expression, connection):
+        nonlocal wire_type, decode
+        if value is None:
+            return None
+        if type(value) is not wire_type:
+            wire_type = type(value)
+            decode = decoders.get(wire_type, fallback)
+        value = decode(value)
+        if finish is not None and value is not None:
+            value = finish(value)
+        return value
+
+    return converter
+
+
+def _make_aware(value, tzinfo):
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=tzinfo)
+    return value
+
+
+def datetimefield_converter(use_tz, tzinfo):
+    return _specialized(
+        {int: _datetime_from_int, str: _datetime_from_str, datetime: _identity},
+        _identity,
+        partial(_make_aware, tzinfo=tzinfo) if use_tz else None,
+    )
+
+
+def datefield_converter():
+    return _specialized(
+        {int: _date_from_int, str: _date_from_str, date: _identity},
+        _date_from_any,
+    )
+
+
+def timefield_converter():
+    return _specialized(
+        {int: _time_from_int, str: _time_from_str, time: _identity},
+        _time_from_any,
+    )
+
+
+def booleanfield_converter(value, expression, connection):
+    if value == 0 or value == 1:
+        return bool(value)
+    return value
@@ -1,9 +1,122 @@
+import hashlib
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
 from django.db.backends.base.creation import BaseDatabaseCreation
+from django.db.migrations.loader import MigrationLoader
+
+SNAPSHOT_PROCEDURES = (
+    """
+CREATE OR REPLACE PROCEDURE %ZDJANGO.NAMESPACE_EXISTS(ns %String) RETURNS %Integer
+LANGUAGE OBJECTSCRIPT
+{
+	quit ##class(%SYS.Namespace).Exists(ns)
+}""",
+    """
+CREATE OR REPLACE PROCEDURE %ZDJANGO.NAMESPACES(prefix %String) RETURNS %String(MAXLEN="")
+LANGUAGE OBJECTSCRIPT
+{
+	new $namespace
+	set $namespace = "%SYS"
+
+	set names = ""
+	set rs = ##class(%ResultSet).%New("Config.Namespaces:List")
+	$$$ThrowOnError(rs.Execute(prefix _ "*"))
+	while rs.Next() {
+		set names = names _ $listbuild(rs.Get("Namespace"))
+	}
+	quit $listtostring(names)
+}""",
+)
+
+
+def _models_modules(app_config):
+    """Modules defining the models of the app, models may be a package."""
+    return {sys.modules[model.__module__] for model in app_config.get_models()}
+
+
+def migration_hash(connection):
+    """
+    Hash of what the test database schema is created from: the migration
+    files in the graph and the models of the apps without migrations, or
+    the models of every app when TEST["MIGRATE"] is False.
+    """
+    migrate = connection.settings_dict["TEST"].get("MIGRATE", True)
+    digest = hashlib.sha256()
+    digest.update(repr(migrate).encode())
+    modules = []
+    if migrate:
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        for key in sorted(loader.graph.nodes):
+            digest.update(repr(key).encode())
+            modules.append(sys.modules[loader.graph.nodes[key].__module__])
+        app_labels = sorted(loader.unmigrated_apps)
+    else:
+        # create_test_db() turns migrations off later, every app is synced
+        app_labels = sorted(app_config.label for app_config in apps.get_app_configs())
+    for app_label in app_labels:
+        digest.update(app_label.encode())
+        models_modules = _models_modules(apps.get_app_config(app_label))
+        modules.extend(sorted(models_modules, key=lambda module: module.__name__))
+    for module in modules:
+        filename = getattr(module, "__file__", None)
+        if filename:
+            with open(filename, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
 
 
 class DatabaseCreation(BaseDatabaseCreation):
+    # Clones made at once by the first _clone_test_db() call, set by
+    # IRISDiscoverRunner to the number of parallel test processes
+    concurrent_clones = 1
+
+    _pending_snapshot = None
+
+    def _namespace_exists(self, cursor, name):
+        cursor.execute("SELECT %%ZDJANGO.NAMESPACE_EXISTS(%s)", [name])
+        return bool(cursor.fetchone()[0])
+
+    def _snapshot_name(self):
+        return "%s_SNAPSHOT_%s" % (
+            self._get_test_db_name(),
+            migration_hash(self.connection)[:12].upper(),
+        )
+
+    def create_test_db(self, *args, **kwargs):
+        # Name of the snapshot to take once the test database is migrated
+        self._pending_snapshot = None
+        test_database_name = super().create_test_db(*args, **kwargs)
+        if self._pending_snapshot:
+            self._take_snapshot(test_database_name, self._pending_snapshot)
+        return test_database_name
+
+    def _take_snapshot(self, test_database_name, snapshot_name):
+        qn = self.connection.ops.quote_name
+        prefix = "%s_SNAPSHOT_" % test_database_name
+        with self._nodb_cursor() as cursor:
+            # Snapshots of former migration states
+            cursor.execute("SELECT %%ZDJANGO.NAMESPACES(%s)", [prefix])
+            for name in (cursor.fetchone()[0] or "").split(","):
+                if name and name.upper() != snapshot_name.upper():
+                    cursor.execute("DROP DATABASE %s" % qn(name))
+            cursor.execute("CREATE DATABASE %s" % qn(snapshot_name))
+            cursor.execute(
+                "CALL %%ZDJANGO.CLONE_DATABASE(%s, %s)",
+                [test_database_name, snapshot_name],
+            )
+
+    def _close_pool(self):
+        """
+        Close the pool, which keeps connecting to the NAME it was created
+        with, before NAME is switched or the database is cloned or dropped.
+        """
+        self.connection.close()
+        self.connection.close_pool()
 
     def _create_test_db(self, verbosity, autoclobber, keepdb=False):
+        self._close_pool()
         with self._nodb_cursor() as cursor:
             cursor.execute("""
 CREATE OR REPLACE PROCEDURE %ZDJANGO.CLONE_DATABASE(sourceNS %String, targetNS %String)
@@ -28,9 +141,48 @@ LANGUAGE OBJECTSCRIPT
 		$$$ThrowOnError(##class(SYS.Database).Copy(from, to, , , 4))
 	}
 }            """)
-        return super()._create_test_db(verbosity, autoclobber, keepdb=keepdb)
+            if not self.connection.settings_dict["TEST"].get("SNAPSHOT"):
+                return super()._create_test_db(verbosity, autoclobber, keepdb=keepdb)
+            for procedure in SNAPSHOT_PROCEDURES:
+                cursor.execute(procedure)
+            test_database_name = self._get_test_db_name()
+            if keepdb and self._namespace_exists(cursor, test_database_name):
+                return test_database_name
+            snapshot_name = self._snapshot_name()
+            snapshot_exists = self._namespace_exists(cursor, snapshot_name)
+
+        test_database_name = super()._create_test_db(
+            verbosity, autoclobber, keepdb=keepdb
+        )
+        if not snapshot_exists:
+            self._pending_snapshot = snapshot_name
+            return test_database_name
+        if verbosity >= 1:
+            self.log("Restoring test database from snapshot %s..." % snapshot_name)
+        # migrate then finds every migration applied
+        with self._nodb_cursor() as cursor:
+            cursor.execute(
+                "CALL %%ZDJANGO.CLONE_DATABASE(%s, %s)",
+                [snapshot_name, test_database_name],
+            )
+        return test_database_name
 
     def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        self._close_pool()
+        if self.concurrent_clones > 1:
+            # The first call clones the databases of all the workers at once
+            cloned = getattr(self, "_concurrent_clones_done", set())
+            if suffix not in cloned:
+                suffixes = [str(index + 1) for index in range(self.concurrent_clones)]
+                if suffix not in suffixes:
+                    suffixes = [suffix]
+                with ThreadPoolExecutor(max_workers=len(suffixes)) as executor:
+                    list(executor.map(self._clone_one_test_db, suffixes))
+                self._concurrent_clones_done = cloned | set(suffixes)
+            return
+        self._clone_one_test_db(suffix)
+
+    def _clone_one_test_db(self, suffix):
         source_database_name = self.connection.settings_dict["NAME"]
         target_database_name = self.get_test_db_clone_settings(suffix)["NAME"]
 
@@ -38,3 +190,24 @@ LANGUAGE OBJECTSCRIPT
             cursor.execute(f"CREATE DATABASE {target_database_name}")
             cursor.execute(f"CALL %ZDJANGO.CLONE_DATABASE('{source_database_name}', '{target_database_name}')")
         
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        self._close_pool()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+    def destroy_test_db(self, *args, **kwargs):
+        super().destroy_test_db(*args, **kwargs)
+        # Back to the original NAME
+        self._close_pool()
+
+    def set_as_test_mirror(self, primary_settings_dict):
+        self._close_pool()
+        super().set_as_test_mirror(primary_settings_dict)
+
+    def setup_worker_connection(self, _worker_id):
+        self.connection.close()
+        # A forked worker inherits the pool of the parent process, with the
+        # parent's connections, leave them to it
+        with self.connection._connection_pools_lock:
+            self.connection._connection_pools.pop(self.connection.alias, None)
+        super().setup_worker_connection(_worker_id)
@@ -1,34 +1,227 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+
+class StatementHandles:
+    """
+    Per-connection LRU of idle driver cursors, keyed by the translated SQL
+    they executed last. Executing the same statement again on the same
+    driver cursor lets the driver reuse the prepared statement instead of
+    sending it to be parsed and planned again.
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        # Bumped on reconnect and schema changes, handles checked out before
+        # that are closed instead of returned
+        self.generation = 0
+        self.prepares = 0
+        self.executes = 0
+        self.evictions = 0
+        self._handles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, sql):
+        with self._lock:
+            return self._handles.pop(sql, None)
+
+    def put(self, sql, cursor, generation):
+        stale = []
+        with self._lock:
+            if self.maxsize <= 0 or generation != self.generation:
+                stale.append(cursor)
+            else:
+                previous = self._handles.pop(sql, None)
+                if previous is not None:
+                    stale.append(previous)
+                self._handles[sql] = cursor
+                while len(self._handles) > self.maxsize:
+                    stale.append(self._handles.popitem(last=False)[1])
+                    self.evictions += 1
+        for cursor in stale:
+            _close_quietly(cursor)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            handles, self._handles = list(self._handles.values()), OrderedDict()
+        for cursor in handles:
+            _close_quietly(cursor)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._handles),
+                "maxsize": self.maxsize,
+                "prepares": self.prepares,
+                "executes": self.executes,
+                "evictions": self.evictions,
+            }
+
+
+def _close_quietly(cursor):
+    try:
+        cursor.close()
+    except:
+        # already closed
+        pass
+
+
 class CursorWrapper:
-    def __init__(self, cursor):
+    def __init__(self, cursor, connection, name=None):
+        self.cursor = cursor
+        self.connection = connection
+        self.name = name
+        # Total of all batches of the last executemany()
+        self._rowcount = None
+        # Statement last executed by self.cursor, when it is a reusable handle
+        self._handle_sql = None
+        self._handle_generation = None
+        # Fingerprint of the last statement, for instrumentation
+        self._stats_key = None
+
+    def _use_handle(self, sql):
+        """
+        Point self.cursor at a driver cursor that already prepared `sql`,
+        when there is one, and count the prepare otherwise.
+        """
+        handles = self.connection.statement_handles
+        if handles.maxsize <= 0 or self.name:
+            return
+        handles.executes += 1
+        if self._handle_sql == sql and self._handle_generation == handles.generation:
+            return
+        cursor = handles.take(sql)
+        if self._handle_sql is not None:
+            handles.put(self._handle_sql, self.cursor, self._handle_generation)
+        elif cursor is not None:
+            _close_quietly(self.cursor)
+        if cursor is None:
+            handles.prepares += 1
+            if self._handle_sql is not None:
+                cursor = self.connection.connection.cursor()
+            else:
+                cursor = self.cursor
         self.cursor = cursor
+        self._handle_sql = sql
+        self._handle_generation = handles.generation
 
     # Django supports only %s params, convert them to ? for IRIS
     def _replace_params(self, query, params_count=0):
+        cache = self.connection.statement_cache
+        key = (query, params_count)
+        translated = cache.get(key)
+        if translated is None:
+            translated = self._translate_params(query, params_count)
+            cache.set(key, translated)
+        return translated
+
+    @staticmethod
+    def _translate_params(query, params_count=0):
         if query.endswith(";"):
             query = query[0:-1]
         # return (query % tuple([f":%qpar({i+1})" for i in range(params_count)])) if params_count > 0 else query.replace('%%', '%')
         return (query % tuple("?" * params_count)) if params_count > 0 else query.replace('%%', '%')
 
     def execute(self, query, params=None):
+        self._rowcount = None
         query = self._replace_params(query, len(params) if params else 0)
-        return self.cursor.execute(query, params)
+        self._use_handle(query)
+        stats = self.connection.query_stats
+        if stats is None:
+            result = self.cursor.execute(query, params)
+        else:
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = self.cursor.execute(query, params)
+                failed = False
+            finally:
+                self._stats_key = stats.record_execute(
+                    query, params, time.perf_counter() - start, failed
+                )
+        self.connection._last_io = time.monotonic()
+        return result
 
     def executemany(self, query, params=None):
-        if not isinstance(params, tuple) and not isinstance(params, list):
-            params = tuple(params)
-        query = self._replace_params(query, len(params[0]) if params else 0)
-        try:
-            return self.cursor.executemany(query, params)
-        except ValueError:
-            # Ignore if missing parameters, suppose just insert nothing
-            pass
+        # Stream parameters to the driver in batches, so a generator with
+        # millions of rows is never materialized at once
+        self._rowcount = 0
+        rows = iter(params if params is not None else ())
+        batch_size = self.connection.executemany_batch_size or None
+        stats = self.connection.query_stats
+        translated = None
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            if translated is None:
+                translated = self._replace_params(query, len(batch[0]))
+                self._use_handle(translated)
+            if stats is None:
+                self.cursor.executemany(translated, batch)
+            else:
+                start = time.perf_counter()
+                failed = True
+                try:
+                    self.cursor.executemany(translated, batch)
+                    failed = False
+                finally:
+                    self._stats_key = stats.record_execute(
+                        translated,
+                        "<%d rows>" % len(batch),
+                        time.perf_counter() - start,
+                        failed,
+                    )
+            self.connection._last_io = time.monotonic()
+            rowcount = self.cursor.rowcount
+            self._rowcount += rowcount if rowcount and rowcount > 0 else 0
+            if batch_size is None:
+                break
+
+    @property
+    def rowcount(self):
+        if self._rowcount is not None:
+            return self._rowcount
+        return self.cursor.rowcount
+
+    def _record_fetch(self, rows):
+        stats = self.connection.query_stats
+        if stats is not None and self._stats_key is not None:
+            stats.record_fetch(self._stats_key, rows)
+
+    def fetchone(self):
+        row = self.cursor.fetchone()
+        self._record_fetch(0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        if size is None:
+            rows = self.cursor.fetchmany()
+        else:
+            # QuerySet.iterator(chunk_size=...) ends up here, let the driver
+            # fetch the same amount of rows per round trip
+            if self.name and size > self.cursor.arraysize:
+                self.cursor.arraysize = size
+            rows = self.cursor.fetchmany(size)
+        self._record_fetch(len(rows) if rows else 0)
+        return rows
+
+    def fetchall(self):
+        rows = self.cursor.fetchall()
+        self._record_fetch(len(rows) if rows else 0)
+        return rows
 
     def close(self):
-        try:
-            self.cursor.close()
-        except:
-            # already closed
-            pass
+        if self._handle_sql is not None:
+            self.connection.statement_handles.put(
+                self._handle_sql, self.cursor, self._handle_generation
+            )
+            self._handle_sql = None
+            return
+        _close_quietly(self.cursor)
 
     def __getattr__(self, attr):
         return getattr(self.cursor, attr)
@@ -0,0 +1,100 @@
+"""
+Query plans from IRIS EXPLAIN.
+
+EXPLAIN returns the plan as XML, a <plan> element per plan, with the SQL,
+its estimated cost, and the plan text, which describes the maps read and
+the modules called, each module in its own <module> element.
+
+    plan = explain(Book.objects.filter(title__startswith="A"))[0]
+    assert "Library.Book.TitleIdx" in plan.indexes
+"""
+import re
+import xml.etree.ElementTree as ET
+
+# "Read index map Library.Book.TitleIdx, ...", "Read extent bitmap ..."
+_map_re = re.compile(
+    r"\b(master map|index map|bitmap index map|extent bitmap) ([\w.%$]+[\w%$])",
+    re.IGNORECASE,
+)
+_parallel_re = re.compile(r"\bparallel\b", re.IGNORECASE)
+
+
+def _text(element):
+    return "".join(element.itertext())
+
+
+class QueryPlan:
+    def __init__(self, sql, cost, text, modules, maps):
+        self.sql = sql
+        self.cost = cost
+        self.text = text
+        self.modules = modules
+        # (kind, map name) in the order they are read
+        self.maps = maps
+
+    @property
+    def indexes(self):
+        """Names of the index maps used."""
+        return [name for kind, name in self.maps if kind != "master map"]
+
+    @property
+    def parallel(self):
+        """Whether any part of the query is processed in parallel."""
+        return bool(_parallel_re.search(self.text))
+
+    @classmethod
+    def from_element(cls, element):
+        sql = element.find("sql")
+        cost = element.find("cost")
+        try:
+            cost = float(cost.get("value")) if cost is not None else None
+        except (TypeError, ValueError):
+            cost = None
+        parts = [element.text or ""]
+        for child in element:
+            if child.tag != "sql":
+                parts.append(_text(child))
+            parts.append(child.tail or "")
+        text = "\n".join(
+            line.strip() for line in "".join(parts).splitlines() if line.strip()
+        )
+        sql_text = " ".join(_text(sql).split()) if sql is not None else ""
+        modules = [
+            module.get("name") for module in element.iter("module") if module.get("name")
+        ]
+        maps = [(kind.lower(), name) for kind, name in _map_re.findall(text)]
+        return cls(sql_text, cost, text, modules, maps)
+
+    def as_dict(self):
+        return {
+            "sql": self.sql,
+            "cost": self.cost,
+            "modules": self.modules,
+            "maps": [{"kind": kind, "name": name} for kind, name in self.maps],
+            "indexes": self.indexes,
+            "parallel": self.parallel,
+            "text": self.text,
+        }
+
+    def __repr__(self):
+        return "<%s: cost=%s indexes=%s>" % (
+            self.__class__.__name__,
+            self.cost,
+            self.indexes,
+        )
+
+
+def parse_plans(xml):
+    """QueryPlan for each <plan> of the EXPLAIN output, several with ALT."""
+    root = ET.fromstring(xml.strip())
+    plans = [root] if root.tag == "plan" else root.iter("plan")
+    return [QueryPlan.from_element(plan) for plan in plans]
+
+
+def explain(queryset, **options):
+    """
+    Parsed plans of the queryset. Options are the ones of
+    QuerySet.explain(), alt=True for alternate plans, stat=True to run the
+    query and add its runtime statistics.
+    """
+    return parse_plans(queryset.explain(format="xml", **options))
@@ -12,7 +12,9 @@ class DatabaseFeatures(BaseDatabaseFeatures):
 
     supports_transactions = True
     uses_savepoints = True
-    has_bulk_insert = True
+    # bulk_create() sends single-row INSERTs through executemany(), instead
+    # of a multi-row statement text, which has to be parsed for every batch
+    has_bulk_insert = False
     has_native_uuid_field = True
     supports_timezones = False
     has_zoneinfo_database = False
@@ -20,6 +22,8 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     test_db_allows_multiple_connections = False
     supports_unspecified_pk = False
     can_return_columns_from_insert = False
+    # Parameters sent with one bulk_create() batch
+    max_query_params = 2**16 - 1
 
     # Does the backend support NULLS FIRST and NULLS LAST in ORDER BY?
     supports_order_by_nulls_modifier = False
@@ -60,10 +64,18 @@ class DatabaseFeatures(BaseDatabaseFeatures):
 
     interprets_empty_strings_as_nulls = False
 
-    supports_ignore_conflicts = False
+    # bulk_create() conflicts go to INSERT OR UPDATE, or to skipped rows,
+    # on any unique key of the table
+    supports_ignore_conflicts = True
+    supports_update_conflicts = True
+    supports_update_conflicts_with_target = False
 
     closed_cursor_error_class = InterfaceError
 
+    # EXPLAIN returns an XML plan, parsed by django_iris.explain for the others
+    supports_explaining_query_execution = True
+    supported_explain_formats = {"XML", "JSON", "TEXT"}
+
     # Does the backend support functions in defaults?
     # IRIS, requires ObjectScript there, no way
     supports_expression_defaults = False
@@ -95,6 +107,8 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     has_json_operators = False
     # Does the backend support __contains and __contained_by lookups for
     # a JSONField?
+    # IRIS: not in general. A dict of scalar values is matched key by key in
+    # JSON_TABLE, other values raise NotSupportedError
     supports_json_field_contains = False
     # Does value__d__contains={'f': 'g'} (without a list around the dict) match
     # {'d': [{'f': 'g'}]}?
@@ -216,6 +230,27 @@ class DatabaseFeatures(BaseDatabaseFeatures):
 
     # django_test_skips["IRIS Bugs"] = django_test_expected_failures
 
+    @cached_property
+    def supports_limit_offset(self):
+        """
+        LIMIT ... OFFSET ... is available since IRIS 2025.1, older versions
+        page with TOP and ROW_NUMBER(). OPTIONS["LIMIT_OFFSET"] overrides it.
+        """
+        option = self.connection.settings_dict["OPTIONS"].get("LIMIT_OFFSET")
+        if option is not None:
+            return option
+        return self.connection.get_database_version() >= (2025, 1)
+
+    @cached_property
+    def can_return_rows_from_bulk_insert(self):
+        """
+        bulk_create() sends the rows with executemany(), which reports no
+        identities. OPTIONS["BULK_CREATE_RETURNING"] set to True inserts
+        them one by one instead, and sets primary keys of the created objects.
+        """
+        options = self.connection.settings_dict["OPTIONS"]
+        return options.get("BULK_CREATE_RETURNING", False)
+
     @cached_property
     def introspected_field_types(self):
         return {
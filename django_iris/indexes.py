@@ -0,0 +1,232 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.db.backends.ddl_references import Columns, Statement
+from django.db.models import Index
+
+from .introspection import schema_name
+
+logger = logging.getLogger("django.db.backends.iris")
+
+# Indexes created with DEFER, until BUILD INDEX has run for them
+PENDING_INDEX_TABLE = "django_iris_pending_index"
+
+
+class CollatedColumns(Columns):
+    def __init__(self, table, columns, quote_name, collation):
+        self.collation = collation
+        super().__init__(table, columns, quote_name)
+
+    def __str__(self):
+        return ", ".join(
+            "%%%%%s(%s)" % (self.collation, self.quote_name(column))
+            for column in self.columns
+        )
+
+
+class CollatedIndex(Index):
+    """
+    Index over the fields in the given collation, "SQLUPPER" makes the
+    case-insensitive lookups index seeks, "EXACT" the case-sensitive ones
+    on columns with the default %SQLUPPER collation.
+
+        class Meta:
+            indexes = [CollatedIndex(fields=["name"], name="name_exact_idx", collation="EXACT")]
+    """
+
+    collations = ("SQLUPPER", "SQLSTRING", "EXACT", "UPPER")
+
+    def __init__(self, *, fields=(), collation="SQLUPPER", **kwargs):
+        if not fields:
+            raise ValueError("CollatedIndex requires fields.")
+        collation = collation.upper().lstrip("%")
+        if collation not in self.collations:
+            raise ValueError(
+                "CollatedIndex.collation must be one of %s."
+                % ", ".join(self.collations)
+            )
+        self.collation = collation
+        super().__init__(fields=fields, **kwargs)
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        statement = super().create_sql(model, schema_editor, using=using, **kwargs)
+        columns = [
+            model._meta.get_field(field_name).column
+            for field_name, _ in self.fields_orders
+        ]
+        statement.parts["columns"] = CollatedColumns(
+            model._meta.db_table, columns, schema_editor.quote_name, self.collation
+        )
+        return statement
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs["collation"] = self.collation
+        return path, args, kwargs
+
+
+class DeferredIndexStatement(Statement):
+    """CREATE INDEX ... DEFER, the index is defined but not built."""
+
+    @property
+    def table_name(self):
+        return self.parts["table"].table
+
+    @property
+    def index_name(self):
+        return str(self.parts["name"]).strip('"')
+
+
+def _pending_table(connection):
+    """The table name with the schema its existence is checked in."""
+    return connection.ops.quote_name("%s.%s" % tuple(schema_name(PENDING_INDEX_TABLE)))
+
+
+def _pending_table_exists(connection, cursor, create=False):
+    # Per namespace, the test database is another one on the same connection
+    namespace = connection.settings_dict["NAME"]
+    if getattr(connection, "_pending_index_table", None) == namespace:
+        return True
+    cursor.execute(
+        "SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+        schema_name(PENDING_INDEX_TABLE),
+    )
+    if not cursor.fetchone()[0]:
+        if not create:
+            return False
+        cursor.execute(
+            "CREATE TABLE %s (table_name VARCHAR(255) NOT NULL, "
+            "index_name VARCHAR(255) NOT NULL, "
+            "created TIMESTAMP DEFAULT CURRENT_TIMESTAMP)" % _pending_table(connection)
+        )
+    connection._pending_index_table = namespace
+    return True
+
+
+def add_pending_index(connection, table_name, index_name):
+    with connection.cursor() as cursor:
+        _pending_table_exists(connection, cursor, create=True)
+        cursor.execute(
+            "INSERT INTO %s (table_name, index_name) VALUES (%%s, %%s)"
+            % _pending_table(connection),
+            [table_name, index_name],
+        )
+
+
+def rename_pending_indexes(connection, old_table_name, new_table_name):
+    with connection.cursor() as cursor:
+        if _pending_table_exists(connection, cursor):
+            cursor.execute(
+                "UPDATE %s SET table_name = %%s WHERE table_name = %%s"
+                % _pending_table(connection),
+                [new_table_name, old_table_name],
+            )
+
+
+def pending_indexes(connection):
+    """{table name: [index names]} of the indexes not built yet."""
+    pending = {}
+    with connection.cursor() as cursor:
+        if not _pending_table_exists(connection, cursor):
+            return pending
+        cursor.execute(
+            "SELECT table_name, index_name FROM %s ORDER BY created"
+            % _pending_table(connection)
+        )
+        for table_name, index_name in cursor.fetchall():
+            names = pending.setdefault(table_name, [])
+            if index_name not in names:
+                names.append(index_name)
+    return pending
+
+
+def _build_table_indexes(connection, table_name, index_names):
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        # Indexes dropped, or of tables dropped, since they were deferred
+        cursor.execute(
+            "SELECT INDEX_NAME FROM INFORMATION_SCHEMA.INDEXES "
+            "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+            schema_name(table_name),
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        built = [name for name in index_names if name in existing]
+        if built:
+            cursor.execute(
+                "BUILD INDEX FOR TABLE %s INDEX %s"
+                % (qn(table_name), ", ".join(qn(name) for name in built))
+            )
+        cursor.executemany(
+            "DELETE FROM %s WHERE table_name = %%s AND index_name = %%s"
+            % _pending_table(connection),
+            [[table_name, name] for name in index_names],
+        )
+    return built
+
+
+def _log_progress(table_name, index_names, done, total, elapsed):
+    logger.info(
+        "Built indexes %s of %s (%d/%d) in %.1fs",
+        ", ".join(index_names),
+        table_name,
+        done,
+        total,
+        elapsed,
+    )
+
+
+def build_pending_indexes(connection, tables=None, workers=1, progress=None):
+    """
+    Run BUILD INDEX for the pending indexes, of the given tables or all,
+    one statement per table. With several workers, the tables are built in
+    parallel, each on its own connection.
+
+    progress(table_name, index_names, done, total, elapsed) is called as
+    each table is done, by default it logs to "django.db.backends.iris".
+    Return {table name: [index names built]}.
+    """
+    pending = pending_indexes(connection)
+    if tables is not None:
+        pending = {
+            table_name: names
+            for table_name, names in pending.items()
+            if table_name in tables
+        }
+    progress = progress or _log_progress
+    total = len(pending)
+    built = {}
+    if workers <= 1 or total <= 1:
+        for done, (table_name, names) in enumerate(pending.items(), 1):
+            start = time.monotonic()
+            built[table_name] = _build_table_indexes(connection, table_name, names)
+            progress(
+                table_name, built[table_name], done, total, time.monotonic() - start
+            )
+        return built
+
+    def build(table_name, names):
+        # Connections are per thread, open one for this build
+        worker = connection.copy()
+        try:
+            start = time.monotonic()
+            return (
+                _build_table_indexes(worker, table_name, names),
+                time.monotonic() - start,
+            )
+        finally:
+            worker.close()
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="django_iris_index_build"
+    ) as executor:
+        futures = {
+            executor.submit(build, table_name, names): table_name
+            for table_name, names in pending.items()
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            table_name = futures[future]
+            built[table_name], elapsed = future.result()
+            progress(table_name, built[table_name], done, total, elapsed)
+    return built
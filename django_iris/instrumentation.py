@@ -0,0 +1,150 @@
+import functools
+import logging
+import math
+import re
+import threading
+
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger("django.db.backends.iris")
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, math.inf)
+
+_string_re = re.compile(r"'(?:[^']|'')*'")
+_number_re = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_in_list_re = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_space_re = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """
+    Normalise SQL, so statements that differ only in literals, IN list
+    lengths or whitespace share the same key.
+    """
+    sql = _string_re.sub("?", sql)
+    sql = _number_re.sub("?", sql)
+    sql = _in_list_re.sub("(...)", sql)
+    return _space_re.sub(" ", sql).strip()
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self):
+        return {
+            "buckets": dict(zip(self.buckets, self.counts)),
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+        }
+
+
+class StatementStats:
+    def __init__(self, sql):
+        self.sql = sql
+        self.latency = Histogram()
+        self.rows = 0
+        self.fetches = 0
+        self.errors = 0
+
+    def as_dict(self):
+        return {
+            "sql": self.sql,
+            "latency": self.latency.as_dict(),
+            "rows": self.rows,
+            "fetches": self.fetches,
+            "errors": self.errors,
+        }
+
+
+class QueryStats:
+    """
+    Per-connection query statistics, aggregated by SQL fingerprint.
+
+    Enabled with OPTIONS["INSTRUMENTATION"], either True or a dict with
+      - SLOW_QUERY_THRESHOLD: seconds, slower statements are logged to
+        the "django.db.backends.iris" logger with their parameters
+      - SINK: callable or its dotted path, export() passes the collected
+        statistics to it, which happens on every connection close
+    """
+
+    def __init__(self, slow_query_threshold=None, sink=None):
+        self.slow_query_threshold = slow_query_threshold
+        if isinstance(sink, str):
+            sink = import_string(sink)
+        self.sink = sink
+        self._statements = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, options):
+        if not options:
+            return None
+        options = options if isinstance(options, dict) else {}
+        return cls(
+            slow_query_threshold=options.get("SLOW_QUERY_THRESHOLD"),
+            sink=options.get("SINK"),
+        )
+
+    def record_execute(self, sql, params, duration, failed=False):
+        key = fingerprint(sql)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = StatementStats(key)
+            stats.latency.observe(duration)
+            if failed:
+                stats.errors += 1
+        if (
+            self.slow_query_threshold is not None
+            and duration >= self.slow_query_threshold
+        ):
+            logger.warning(
+                "Slow query (%.3f) %s; args=%s",
+                duration,
+                sql,
+                params,
+                extra={"duration": duration, "sql": sql, "params": params},
+            )
+        return key
+
+    def record_fetch(self, key, rows):
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is not None:
+                stats.rows += rows
+                stats.fetches += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {key: stats.as_dict() for key, stats in self._statements.items()}
+
+    def reset(self):
+        with self._lock:
+            self._statements = {}
+
+    def export(self):
+        """Pass the collected statistics to the sink and start over."""
+        if self.sink is None:
+            return
+        with self._lock:
+            statements, self._statements = self._statements, {}
+        if statements:
+            self.sink({key: stats.as_dict() for key, stats in statements.items()})
@@ -1,4 +1,6 @@
-from collections import namedtuple
+import re
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
 
 from django.db.backends.base.introspection import (
     BaseDatabaseIntrospection, FieldInfo as BaseFieldInfo, TableInfo,
@@ -19,7 +21,103 @@ def schema_name(table_name):
     return [table_schema, table_name, ]
 
 
+# The table a DDL statement changes, "schema"."table" or "table"
+_ddl_table_re = re.compile(
+    r'\b(?:TABLE|ON)\s+"([^"]+)"(?:\."([^"]+)")?', re.IGNORECASE)
+
+# Metadata queries, each selecting the table name first, for one table or,
+# without the table filter, for the whole schema at once
+METADATA_QUERIES = {
+    'columns': ("""
+        SELECT
+            TABLE_NAME,
+            COLUMN_NAME,
+            DATA_TYPE,
+            CHARACTER_MAXIMUM_LENGTH,
+            NUMERIC_PRECISION,
+            NUMERIC_SCALE,
+            IS_NULLABLE,
+            AUTO_INCREMENT,
+            COLUMN_DEFAULT
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = %s
+        AND NOT (AUTO_INCREMENT = 'YES' AND PRIMARY_KEY = 'NO')
+        {table_filter}
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+    """, 'TABLE_NAME'),
+    'relations': ("""
+        SELECT table_name, column_name, referenced_column_name, referenced_table_name
+        FROM information_schema.key_column_usage
+        WHERE table_schema = %s
+            AND referenced_table_name IS NOT NULL
+            AND referenced_column_name IS NOT NULL
+            {table_filter}
+    """, 'table_name'),
+    'keys': ("""
+        SELECT kc.table_name, kc.constraint_name, kc.column_name,
+            kc.referenced_table_name, kc.referenced_column_name,
+            c.constraint_type
+        FROM
+            information_schema.key_column_usage AS kc,
+            information_schema.table_constraints AS c
+        WHERE
+            kc.table_schema = %s AND
+            c.table_schema = kc.table_schema AND
+            c.constraint_name = kc.constraint_name AND
+            c.constraint_type != 'CHECK'
+            {table_filter}
+        ORDER BY kc.table_name, kc.ordinal_position
+    """, 'kc.table_name'),
+    'checks': ("""
+        SELECT tc.table_name, cc.constraint_name, cc.check_clause
+        FROM
+            information_schema.check_constraints AS cc,
+            information_schema.table_constraints AS tc
+        WHERE
+            cc.constraint_schema = %s AND
+            tc.table_schema = cc.constraint_schema AND
+            cc.constraint_name = tc.constraint_name AND
+            tc.constraint_type = 'CHECK'
+            {table_filter}
+    """, 'tc.table_name'),
+    'indexes': ("""
+        SELECT
+            TABLE_NAME,
+            INDEX_NAME,
+            COLUMN_NAME,
+            PRIMARY_KEY,
+            NON_UNIQUE,
+            ASC_OR_DESC
+        FROM INFORMATION_SCHEMA.INDEXES
+        WHERE TABLE_SCHEMA = %s
+          {table_filter}
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+    """, 'TABLE_NAME'),
+}
+
+
+class SchemaCache:
+    """
+    Metadata of whole schemas, loaded with one query per kind the first
+    time a table of the schema is introspected. Tables changed since then
+    are introspected one by one.
+    """
+
+    def __init__(self):
+        self.schemas = {}
+        self.stale = set()
+
+    def invalidate(self, table_name=None):
+        if table_name is None:
+            self.schemas.clear()
+            self.stale.clear()
+        else:
+            self.stale.add(tuple(schema_name(table_name)))
+
+
 class DatabaseIntrospection(BaseDatabaseIntrospection):
+    _schema_cache = None
+    _schema_cache_depth = 0
     data_types_reverse = {
         'bigint': 'BigIntegerField',
         'varchar': 'CharField',
@@ -44,6 +142,64 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
             return 'AutoField'
         return field_type
 
+    @contextmanager
+    def schema_cache(self):
+        """
+        Introspect whole schemas with a few queries, and keep their metadata
+        until the outermost block exits. The schema editor and inspectdb
+        run within one.
+        """
+        if self._schema_cache is None:
+            self._schema_cache = SchemaCache()
+        self._schema_cache_depth += 1
+        try:
+            yield self._schema_cache
+        finally:
+            self._schema_cache_depth -= 1
+            if not self._schema_cache_depth:
+                self._schema_cache = None
+
+    def invalidate_schema_cache(self, sql=None):
+        """
+        Forget the metadata of the table changed by the DDL statement, of
+        all tables when it isn't known.
+        """
+        if self._schema_cache is None:
+            return
+        match = _ddl_table_re.search(str(sql)) if sql is not None else None
+        if match is None:
+            self._schema_cache.invalidate()
+        elif match[2] is None:
+            self._schema_cache.invalidate(match[1])
+        else:
+            self._schema_cache.invalidate('%s.%s' % (match[1], match[2]))
+
+    def _metadata(self, cursor, kind, table_name):
+        """
+        Rows of the metadata query of the given kind for the table, without
+        the table name column.
+        """
+        table_schema, table = schema_name(table_name)
+        query, table_column = METADATA_QUERIES[kind]
+        cache = self._schema_cache
+        if cache is not None and (table_schema, table) not in cache.stale:
+            if table_schema not in cache.schemas:
+                cache.schemas[table_schema] = tables = {}
+                for name, (schema_query, _) in METADATA_QUERIES.items():
+                    cursor.execute(schema_query.format(table_filter=''), [table_schema])
+                    tables[name] = by_table = defaultdict(list)
+                    for row in cursor.fetchall():
+                        by_table[row[0]].append(row[1:])
+            tables = cache.schemas[table_schema]
+            # Unknown tables, as created later, are queried on their own
+            if table in tables['columns']:
+                return tables[kind].get(table, [])
+        cursor.execute(
+            query.format(table_filter='AND %s = %%s' % table_column),
+            [table_schema, table],
+        )
+        return [row[1:] for row in cursor.fetchall()]
+
     def get_sequences(self, cursor, table_name, table_fields=()):
         """
         Return a list of introspected sequences for table_name. Each sequence
@@ -51,7 +207,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         'name' key can be added if the backend supports named sequences.
         """
         for field_info in self.get_table_description(cursor, table_name):
-            if 'auto_increment' in field_info and field_info['auto_increment']:
+            if field_info.auto_increment:
                 return [{'table': table_name, 'column': field_info.name}]
         return []
 
@@ -70,29 +226,12 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         Return a description of the table with the DB-API cursor.description
         interface.
         """
-        cursor.execute(
-            "SELECT TOP 1 * FROM %s" % self.connection.ops.quote_name(table_name)
-        )
-
-        cursor.execute("""
-            SELECT 
-                COLUMN_NAME,
-                DATA_TYPE,
-                CHARACTER_MAXIMUM_LENGTH,
-                NUMERIC_PRECISION,
-                NUMERIC_SCALE,
-                IS_NULLABLE,
-                AUTO_INCREMENT,
-                COLUMN_DEFAULT
-            FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_SCHEMA = %s
-            AND TABLE_NAME = %s
-            AND NOT (AUTO_INCREMENT = 'YES' AND PRIMARY_KEY = 'NO')
-            ORDER BY ORDINAL_POSITION
-        """,
-                       schema_name(table_name)
-                       )
-        
+        rows = self._metadata(cursor, 'columns', table_name)
+        if not rows:
+            # Raises for a missing table
+            cursor.execute(
+                "SELECT TOP 1 * FROM %s" % self.connection.ops.quote_name(table_name)
+            )
         description = [
             FieldInfo(
                 name,
@@ -106,7 +245,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
                 '',
                 auto_increment == 'YES',
             )
-            for name, data_type, length, precision, scale, isnull, auto_increment, column_default in cursor.fetchall()
+            for name, data_type, length, precision, scale, isnull, auto_increment, column_default in rows
         ]
         return description
 
@@ -116,18 +255,10 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         representing all relationships to the given table.
         """
 
-        # Dictionary of relations to return
-        cursor.execute("""
-            SELECT column_name, referenced_column_name, referenced_table_name
-            FROM information_schema.key_column_usage
-            WHERE table_schema = %s
-                AND table_name = %s
-                AND referenced_table_name IS NOT NULL
-                AND referenced_column_name IS NOT NULL
-        """, schema_name(table_name))
         return {
             field_name: (other_field, other_table)
-            for field_name, other_field, other_table in cursor.fetchall()
+            for field_name, other_field, other_table in self._metadata(
+                cursor, 'relations', table_name)
         }
 
     # def get_primary_key_column(self, cursor, table_name):
@@ -157,23 +288,8 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         """
         constraints = {}
         # Get the actual constraint names and columns
-        name_query = """
-            SELECT kc.constraint_name, kc.column_name,
-                kc.referenced_table_name, kc.referenced_column_name,
-                c.constraint_type
-            FROM
-                information_schema.key_column_usage AS kc,
-                information_schema.table_constraints AS c
-            WHERE
-                kc.table_schema = %s AND
-                kc.table_name = %s AND
-                c.table_schema = kc.table_schema AND
-                c.constraint_name = kc.constraint_name AND
-                c.constraint_type != 'CHECK'
-            ORDER BY kc.ordinal_position
-        """
-        cursor.execute(name_query, schema_name(table_name))
-        for constraint, column, ref_table, ref_column, kind in cursor.fetchall():
+        for constraint, column, ref_table, ref_column, kind in self._metadata(
+                cursor, 'keys', table_name):
             if constraint not in constraints:
                 constraints[constraint] = {
                     'columns': OrderedSet(),
@@ -191,20 +307,8 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
             unnamed_constraints_index = 0
             columns = {info.name for info in self.get_table_description(
                 cursor, table_name)}
-            type_query = """
-                SELECT cc.constraint_name, cc.check_clause
-                FROM
-                    information_schema.check_constraints AS cc,
-                    information_schema.table_constraints AS tc
-                WHERE
-                    cc.constraint_schema = %s AND
-                    tc.table_schema = cc.constraint_schema AND
-                    cc.constraint_name = tc.constraint_name AND
-                    tc.constraint_type = 'CHECK' AND
-                    tc.table_name = %s
-            """
-            cursor.execute(type_query, schema_name(table_name))
-            for constraint, check_clause in cursor.fetchall():
+            for constraint, check_clause in self._metadata(
+                    cursor, 'checks', table_name):
                 constraint_columns = self._parse_constraint_columns(
                     check_clause, columns)
                 # Ensure uniqueness of unnamed constraints. Unnamed unique
@@ -222,20 +326,8 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
                     'foreign_key': None,
                 }
 
-        index_query = """
-            SELECT 
-                INDEX_NAME, 
-                COLUMN_NAME, 
-                PRIMARY_KEY,
-                NON_UNIQUE,
-                ASC_OR_DESC
-            FROM INFORMATION_SCHEMA. INDEXES
-            WHERE TABLE_SCHEMA = %s
-              AND TABLE_NAME = %s
-            ORDER BY ORDINAL_POSITION
-        """
-        cursor.execute(index_query, schema_name(table_name))
-        for index, column, primary, non_unique, order in cursor.fetchall():
+        for index, column, primary, non_unique, order in self._metadata(
+                cursor, 'indexes', table_name):
             if index not in constraints:
                 constraints[index] = {
                     'columns': OrderedSet(),
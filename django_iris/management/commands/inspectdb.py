@@ -0,0 +1,13 @@
+from django.core.management.commands import inspectdb
+from django.db import connections
+
+
+class Command(inspectdb.Command):
+    def handle_inspection(self, options):
+        connection = connections[options["database"]]
+        if connection.vendor != "intersystems":
+            yield from super().handle_inspection(options)
+            return
+        # Metadata of each schema in a few queries instead of several per table
+        with connection.introspection.schema_cache():
+            yield from super().handle_inspection(options)
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_iris.indexes import build_pending_indexes, pending_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "List the indexes created with DEFER and not built yet, "
+        "or build them with --build."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "tables",
+            nargs="*",
+            help="Only the indexes of these tables.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database. Defaults to the "default" database.',
+        )
+        parser.add_argument(
+            "--build",
+            action="store_true",
+            help="Run BUILD INDEX for the pending indexes.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Tables built in parallel, defaults to INDEX_BUILD_WORKERS.",
+        )
+
+    def handle(self, *tables, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "intersystems":
+            raise CommandError(
+                "%s is not an InterSystems IRIS database." % connection.alias
+            )
+        tables = set(tables) or None
+        if options["build"]:
+            workers = options["workers"] or connection.settings_dict["OPTIONS"].get(
+                "INDEX_BUILD_WORKERS", 1
+            )
+            built = build_pending_indexes(
+                connection, tables=tables, workers=workers, progress=self.progress
+            )
+            if not built:
+                self.stdout.write("No pending indexes.")
+            return
+        pending = pending_indexes(connection)
+        if tables is not None:
+            pending = {t: names for t, names in pending.items() if t in tables}
+        if not pending:
+            self.stdout.write("No pending indexes.")
+        for table_name, names in pending.items():
+            self.stdout.write("%s: %s" % (table_name, ", ".join(names)))
+
+    def progress(self, table_name, index_names, done, total, elapsed):
+        self.stdout.write(
+            "[%d/%d] %s: %s (%.1fs)"
+            % (done, total, table_name, ", ".join(index_names) or "-", elapsed)
+        )
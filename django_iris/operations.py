@@ -1,11 +1,11 @@
 from django.conf import settings
-from django.db import DatabaseError
+from django.db import DatabaseError, NotSupportedError
 from django.db.backends.base.operations import BaseDatabaseOperations
 from django.db.backends.utils import split_tzname_delta
 from django.utils import timezone
-from datetime import date, datetime, timedelta
-from django.utils.dateparse import parse_date, parse_datetime, parse_time
+from datetime import datetime
 from django.db.models.expressions import RawSQL, ExpressionWrapper, Exists
+from django.db.models.constants import OnConflict
 from django.db.models.lookups import Lookup
 from django.db.models.sql.where import WhereNode
 
@@ -14,7 +14,12 @@ try:
 except ImportError:
     from django.utils.timezone import timezone as timezone_constructor  # Django 5+
 
-from .utils import BulkInsertMapper
+from .converters import (
+    booleanfield_converter,
+    datefield_converter,
+    datetimefield_converter,
+    timefield_converter,
+)
 
 
 class DatabaseOperations(BaseDatabaseOperations):
@@ -73,6 +78,9 @@ class DatabaseOperations(BaseDatabaseOperations):
         return None
 
     def limit_offset_sql(self, low_mark, high_mark):
+        if self.connection.features.supports_limit_offset:
+            return super().limit_offset_sql(low_mark, high_mark)
+        # SQLCompiler.as_sql() pages with TOP and ROW_NUMBER() instead
         return ""
 
     def adapt_datetimefield_value(self, value):
@@ -105,58 +113,17 @@ class DatabaseOperations(BaseDatabaseOperations):
         converters = super().get_db_converters(expression)
         internal_type = expression.output_field.get_internal_type()
         if internal_type == "DateTimeField":
-            converters.append(self.convert_datetimefield_value)
+            converters.append(
+                datetimefield_converter(settings.USE_TZ, self.connection.timezone)
+            )
         elif internal_type == "TimeField":
-            converters.append(self.convert_timefield_value)
+            converters.append(timefield_converter())
         elif internal_type == "DateField":
-            converters.append(self.convert_datefield_value)
+            converters.append(datefield_converter())
         elif internal_type == "BooleanField":
-            converters.append(self.convert_booleanfield_value)
+            converters.append(booleanfield_converter)
         return converters
 
-    def convert_booleanfield_value(self, value, expression, connection):
-        if value in (0, 1):
-            value = bool(value)
-        return value
-
-    def convert_datetimefield_value(self, value, expression, connection):
-        if value is not None:
-            if isinstance(value, int):
-                if value > 0:
-                    value -= 2**60
-                else:
-                    value -= -(2**61 * 3)
-                value = value / 1000000
-                value = datetime.fromtimestamp(value)
-            elif isinstance(value, str):
-                if value != "":
-                    value = parse_datetime(value)
-        if value is not None:
-            if settings.USE_TZ and not timezone.is_aware(value):
-                value = timezone.make_aware(value, self.connection.timezone)
-        return value
-
-    def convert_datefield_value(self, value, expression, connection):
-        if value is not None:
-            if not isinstance(value, type(datetime.date)):
-                try:
-                    value = int(value)
-                    value = date.fromordinal(672046 + value)
-                except Exception:
-                    value = parse_date(value)
-        return value
-
-    def convert_timefield_value(self, value, expression, connection):
-        if value is not None:
-            if not isinstance(value, type(datetime.time)):
-                try:
-                    value = int(value)
-                    value = timedelta(seconds=value)
-                    value = (datetime.min + value).time()
-                except Exception:
-                    value = parse_time(value)
-        return value
-
     def conditional_expression_supported_in_where_clause(self, expression):
         if isinstance(expression, (Exists, Lookup, WhereNode)):
             return True
@@ -196,8 +163,14 @@ class DatabaseOperations(BaseDatabaseOperations):
     def lookup_cast(self, lookup_type, internal_type=None):
         if lookup_type in ("TEXT", "LONG BINARY"):
             return "CONVERT(VARCHAR, %s)"
+        if lookup_type in ("iexact", "icontains", "istartswith", "iendswith"):
+            return "%%%%SQLUPPER(%s)"
         return "%s"
 
+    def prep_for_iexact_query(self, x):
+        # iexact is an equality in %SQLUPPER collation, not a LIKE pattern
+        return x
+
     def max_name_length(self):
         """
         Return the maximum length of table and column names, or None if there
@@ -256,18 +229,40 @@ class DatabaseOperations(BaseDatabaseOperations):
         sql, params = self._convert_sql_to_tz(sql, params, tzname)
         return f"TIME({sql})", params
 
+    def _trunc_sql(self, lookup_type, sql, params):
+        """
+        Truncate by counting the whole units since an epoch and adding them
+        back to it, with no formatting and parsing of every value.
+        """
+        # A Monday, weeks start on it
+        epoch = "'1900-01-01'"
+        if lookup_type in ("year", "month", "day", "hour", "minute"):
+            return (
+                f"DATEADD({lookup_type}, DATEDIFF({lookup_type}, {epoch}, {sql}), {epoch})"
+            ), params
+        if lookup_type in ("quarter", "week"):
+            unit, size = ("month", 3) if lookup_type == "quarter" else ("day", 7)
+            units = f"DATEDIFF({unit}, {epoch}, {sql})"
+            return (
+                f"DATEADD({unit}, ({units} - ({units} # {size})), {epoch})"
+            ), (*params, *params)
+        if lookup_type == "second":
+            # Count seconds within the day, not billions since the epoch
+            day, day_params = self._trunc_sql("day", sql, params)
+            return f"DATEADD(second, DATEDIFF(second, {day}, {sql}), {day})", (
+                *day_params,
+                *params,
+                *day_params,
+            )
+        return None, params
+
     def date_trunc_sql(self, lookup_type, sql, params, tzname=None):
         sql, params = self._convert_sql_to_tz(sql, params, tzname)
         sql = f"CAST({sql} as DATE)"
 
-        if lookup_type == "year":
-            return f"CAST(TO_CHAR(DATE({sql}), 'YYYY-01-01') AS DATE)", params
-        if lookup_type == "month":
-            return f"CAST(TO_CHAR(DATE({sql}), 'YYYY-MM-01') AS DATE)", params
-        if lookup_type == "week":
-            return (
-                f"CAST(DATEADD(DAY, - ((DATEPART(WEEKDAY, {sql}) + 5) # 7 ), {sql}) AS DATE)"
-            ), (*params,)
+        trunc_sql, trunc_params = self._trunc_sql(lookup_type, sql, params)
+        if trunc_sql is not None:
+            return f"CAST({trunc_sql} AS DATE)", trunc_params
 
         return f"DATE({sql})", params
 
@@ -275,23 +270,9 @@ class DatabaseOperations(BaseDatabaseOperations):
         sql, params = self._convert_sql_to_tz(sql, params, tzname)
         sql = f"CAST({sql} as TIMESTAMP)"
 
-        fields = ["year", "month", "day", "hour", "minute", "second"]
-        format = ("YYYY-", "MM", "-DD", " HH24:", "MI", ":SS")
-        format_def = ("0000-", "01", "-01", " 00:", "00", ":00")
-
-        if lookup_type == "week":
-            format_str = "YYYY-MM-DD 00:00:00"
-            return (
-                f"CAST(TO_CHAR(DATEADD(DAY, - ((DATEPART(WEEKDAY, {sql}) + 5) # 7 ), {sql}), %s) AS DATETIME)"
-            ), (*params, format_str)
-
-        try:
-            i = fields.index(lookup_type) + 1
-        except ValueError:
-            pass
-        else:
-            format_str = "".join(format[:i] + format_def[i:])
-            return f"CAST(TO_CHAR({sql}, %s) AS TIMESTAMP)", (*params, format_str)
+        trunc_sql, trunc_params = self._trunc_sql(lookup_type, sql, params)
+        if trunc_sql is not None:
+            return f"CAST({trunc_sql} AS TIMESTAMP)", trunc_params
 
         return sql, params
 
@@ -325,34 +306,54 @@ class DatabaseOperations(BaseDatabaseOperations):
             statement = statement.replace("( ", "(")
         return statement
 
+    explain_prefix = "EXPLAIN"
+
+    def explain_query_prefix(self, format=None, **options):
+        # ALT adds the alternate plans, STAT runs the query for statistics
+        extra = [name.upper() for name in ("alt", "stat") if options.pop(name, False)]
+        prefix = super().explain_query_prefix(format, **options)
+        return " ".join([prefix, *extra])
+
     def insert_statement(self, on_conflict=None):
-        if self.connection._disable_constraint_checking:
+        # Conflicts are found by the uniqueness checks, %NOCHECK skips them
+        if on_conflict == OnConflict.UPDATE:
+            return "INSERT OR UPDATE"
+        if self.connection._disable_constraint_checking and on_conflict is None:
             return "INSERT %%NOCHECK INTO"
         return "INSERT INTO"
 
+    def on_conflict_suffix_sql(self, fields, on_conflict, update_fields, unique_fields):
+        if on_conflict == OnConflict.UPDATE:
+            # INSERT OR UPDATE overwrites every inserted column of the existing
+            # row, only the ones of unique fields keep their values anyway
+            update_fields = set(update_fields)
+            overwritten = [
+                field.column
+                for field in fields
+                if field is not None
+                and not field.unique
+                and field.column not in update_fields
+            ]
+            if overwritten:
+                raise NotSupportedError(
+                    "IRIS updates all inserted fields on conflict, update_fields "
+                    "must include %s." % ", ".join(overwritten)
+                )
+        return ""
+
     def format_for_duration_arithmetic(self, sql):
         """Do nothing since formatting is handled in the custom function."""
         return sql
 
-    def bulk_insert_sql(self, fields, placeholder_rows):
-        query = []
-        for row in placeholder_rows:
-            select = []
-            for i, placeholder in enumerate(row):
-                # A model without any fields has fields=[None].
-                if fields[i]:
-                    internal_type = getattr(
-                        fields[i], "target_field", fields[i]
-                    ).get_internal_type()
-                    placeholder = (
-                        BulkInsertMapper.types.get(internal_type, "%s") % placeholder
-                    )
-                select.append(placeholder)
-            query.append("SELECT %s " % ", ".join(select))
-        # Bulk insert to tables with Oracle identity columns causes Oracle to
-        # add sequence.nextval to it. Sequence.nextval cannot be used with the
-        # UNION operator. To prevent incorrect SQL, move UNION to a subquery.
-        return "SELECT * FROM (%s)" % " UNION ALL ".join(query)
+    def bulk_batch_size(self, fields, objs):
+        """
+        Rows are inserted one statement each, through executemany(), limit
+        a batch by the parameters it sends.
+        """
+        fields = list(fields)
+        if fields:
+            return max(self.connection.features.max_query_params // len(fields), 1)
+        return len(objs)
 
     def combine_duration_expression(self, connector, sub_expressions):
         if connector not in ["+", "-"]:
@@ -0,0 +1,99 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q
+
+
+def _ordering(queryset):
+    query = queryset.query
+    if query.order_by:
+        ordering = list(query.order_by)
+    elif query.default_ordering:
+        ordering = list(queryset.model._meta.ordering)
+    else:
+        ordering = []
+    if not ordering:
+        raise ValueError("Keyset pagination requires an ordered queryset.")
+    fields = []
+    for item in ordering:
+        if not isinstance(item, str) or item == "?":
+            raise ValueError(
+                "Keyset pagination supports ordering by field names only, got %r."
+                % (item,)
+            )
+        descending = item.startswith("-")
+        fields.append((item.lstrip("-+"), descending))
+    names = {name for name, _ in fields}
+    pk_name = queryset.model._meta.pk.name
+    if not names & {"pk", pk_name}:
+        # Make the ordering total, so no row is skipped or repeated
+        fields.append(("pk", fields[-1][1]))
+    return fields
+
+
+def _value(row, name):
+    if isinstance(row, dict):
+        return row[name]
+    for attr in name.split("__"):
+        row = getattr(row, attr)
+    return row
+
+
+def _nullable(model, name):
+    """Whether the ordering field can be NULL, through nullable joins too."""
+    opts = model._meta
+    for part in name.split("__"):
+        try:
+            field = opts.pk if part == "pk" else opts.get_field(part)
+        except FieldDoesNotExist:
+            # Annotations, anything goes
+            return True
+        if field.null:
+            return True
+        if field.is_relation:
+            opts = field.related_model._meta
+    return False
+
+
+def _seek(queryset, fields, after):
+    """
+    Rows after `after` in the ordering: greater in the first field, or
+    equal in it and greater in the next one, and so on.
+    """
+    # NULLs sort as the largest values, unless the backend puts them first
+    nulls_largest = not connections[queryset.db].features.order_by_nulls_first
+    condition = Q()
+    equal = Q()
+    for name, descending in fields:
+        value = _value(after, name)
+        nulls_follow = nulls_largest != descending
+        if value is None:
+            greater = None if nulls_follow else Q(**{"%s__isnull" % name: False})
+            same = Q(**{"%s__isnull" % name: True})
+        else:
+            lookup = "%s__%s" % (name, "lt" if descending else "gt")
+            greater = Q(**{lookup: value})
+            if nulls_follow and _nullable(queryset.model, name):
+                greater |= Q(**{"%s__isnull" % name: True})
+            same = Q(**{name: value})
+        if greater is not None:
+            condition |= equal & greater
+        equal &= same
+    return condition
+
+
+def keyset_page(queryset, size, after=None):
+    """
+    Return the `size` rows of an ordered queryset that follow the row
+    `after` (a model instance or a dict of the ordering values), or the
+    first page without it.
+
+    The page is found by a seek on the ordering columns instead of skipping
+    rows with OFFSET, so every page costs the same. NULLs of nullable
+    ordering fields are placed where the backend sorts them. Pass the last
+    row of a page as `after` to get the next one.
+    """
+    fields = _ordering(queryset)
+    if after is not None:
+        queryset = queryset.filter(_seek(queryset, fields, after))
+    ordering = ["-%s" % name if descending else name for name, descending in fields]
+    return list(queryset.order_by(*ordering)[:size])
@@ -0,0 +1,213 @@
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections.
+
+    Connections are created with `connect()`, handed out with `getconn()`
+    and given back with `putconn()`, which runs `reset(connection)` first.
+    A connection that fails to reset, outlived `max_lifetime` or sat idle
+    longer than `max_idle` (while the pool is above `min_size`) is closed
+    instead of reused.
+    """
+
+    def __init__(
+        self,
+        connect,
+        reset=None,
+        min_size=0,
+        max_size=10,
+        max_lifetime=3600.0,
+        max_idle=600.0,
+        timeout=30.0,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(
+                "Invalid pool size: min_size=%s, max_size=%s" % (min_size, max_size)
+            )
+        self._connect = connect
+        self._reset = reset
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        # LIFO stack of (connection, created_at, returned_at)
+        self._idle = deque()
+        # id(connection) -> created_at, for checked out connections
+        self._in_use = {}
+        self._size = 0
+        self._opened = False
+        self._closed = False
+
+        self._requests = 0
+        self._waiting = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._connections_created = 0
+        self._connections_closed = 0
+
+    def open(self):
+        with self._cond:
+            if self._opened:
+                return
+            self._opened = True
+            missing = max(self.min_size - self._size, 0)
+            self._size += missing
+        for _ in range(missing):
+            try:
+                conn = self._new_connection()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append((conn, time.monotonic(), time.monotonic()))
+                self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._close_connection(conn)
+
+    def getconn(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        expired = []
+        conn = None
+        try:
+            with self._cond:
+                if self._closed:
+                    raise OperationalError("The connection pool is closed.")
+                self._requests += 1
+                try:
+                    while True:
+                        now = time.monotonic()
+                        while self._idle:
+                            candidate, created, returned = self._idle.pop()
+                            if self._is_expired(now, created, returned):
+                                self._size -= 1
+                                expired.append(candidate)
+                                continue
+                            conn = candidate
+                            self._in_use[id(conn)] = created
+                            break
+                        if conn is not None:
+                            break
+                        if self._size < self.max_size:
+                            self._size += 1
+                            break
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise OperationalError(
+                                "Couldn't get a connection from the pool "
+                                "after %.2f seconds." % self.timeout
+                            )
+                        # Only the requests blocked here are waiting
+                        self._waiting += 1
+                        try:
+                            self._cond.wait(remaining)
+                        finally:
+                            self._waiting -= 1
+                finally:
+                    self._record_wait(time.monotonic() - start)
+        finally:
+            for candidate in expired:
+                self._close_connection(candidate)
+
+        if conn is None:
+            try:
+                conn = self._new_connection()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._in_use[id(conn)] = time.monotonic()
+        return conn
+
+    def putconn(self, conn):
+        with self._cond:
+            created = self._in_use.pop(id(conn), None)
+        if created is None:
+            raise ValueError("Connection does not belong to this pool.")
+
+        reusable = True
+        if self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception:
+                reusable = False
+
+        now = time.monotonic()
+        with self._cond:
+            if (
+                reusable
+                and not self._closed
+                and now - created < self.max_lifetime
+            ):
+                self._idle.append((conn, created, now))
+                conn = None
+            else:
+                self._size -= 1
+            self._cond.notify()
+        if conn is not None:
+            self._close_connection(conn)
+
+    def get_stats(self):
+        with self._cond:
+            in_use = len(self._in_use)
+            return {
+                "pool_min": self.min_size,
+                "pool_max": self.max_size,
+                "pool_size": self._size,
+                "pool_available": len(self._idle),
+                "pool_in_use": in_use,
+                "utilisation": in_use / self.max_size,
+                "requests_waiting": self._waiting,
+                "requests_num": self._requests,
+                "requests_wait_ms": round(self._wait_time * 1000, 3),
+                "requests_wait_max_ms": round(self._max_wait_time * 1000, 3),
+                "requests_timeouts": self._timeouts,
+                "connections_num": self._connections_created,
+                "connections_closed": self._connections_closed,
+            }
+
+    def _is_expired(self, now, created, returned):
+        if now - created >= self.max_lifetime:
+            return True
+        return self._size > self.min_size and now - returned >= self.max_idle
+
+    def _record_wait(self, wait):
+        self._wait_time += wait
+        if wait > self._max_wait_time:
+            self._max_wait_time = wait
+
+    def _new_connection(self):
+        conn = self._connect()
+        with self._cond:
+            self._connections_created += 1
+        return conn
+
+    def _close_connection(self, conn):
+        with self._cond:
+            self._connections_closed += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
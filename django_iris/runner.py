@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.db import connections
 from django.test.runner import DiscoverRunner
 from testcontainers.iris import IRISContainer
 
@@ -51,6 +52,11 @@ class IRISDiscoverRunner(DiscoverRunner):
 
     def setup_databases(self, **kwargs):
         self._setup_container()
+        if self.parallel > 1:
+            # Clone the databases of all test processes concurrently
+            for connection in connections.all():
+                if connection.vendor == "intersystems":
+                    connection.creation.concurrent_clones = self.parallel
         return super().setup_databases(**kwargs)
 
     def teardown_databases(self, old_config, **kwargs):
@@ -1,7 +1,63 @@
 from decimal import Decimal
 
 from django.db.backends.base.schema import BaseDatabaseSchemaEditor
-from django.db import NotSupportedError, models
+from django.db import NotSupportedError, connections, models
+from django.db.models.signals import post_migrate, pre_migrate
+
+from .indexes import (
+    DeferredIndexStatement,
+    add_pending_index,
+    build_pending_indexes,
+    rename_pending_indexes,
+)
+
+
+def _end_migrate_run(connection):
+    connection._index_builds_after_migrate = False
+    connection._migrate_run = None
+    schema_cache = connection._migrate_schema_cache
+    if schema_cache is not None:
+        connection._migrate_schema_cache = None
+        schema_cache.__exit__(None, None, None)
+
+
+def defer_index_builds_to_post_migrate(using, plan=None, **kwargs):
+    # Sent once per app with the same plan, the first one starts the run
+    connection = connections[using]
+    if connection.vendor != "intersystems":
+        return
+    if plan is not None and connection._migrate_run is plan:
+        return
+    # Left behind by a run that failed outside of a schema editor
+    _end_migrate_run(connection)
+    connection._migrate_run = plan
+    connection._index_builds_after_migrate = True
+    # Constraint names are introspected from schema-wide metadata, loaded
+    # once for all the migrations of the run
+    schema_cache = connection.introspection.schema_cache()
+    schema_cache.__enter__()
+    connection._migrate_schema_cache = schema_cache
+
+
+def build_indexes_on_post_migrate(using, **kwargs):
+    # Sent once per app, the first one builds the indexes of the whole run
+    connection = connections[using]
+    if connection.vendor != "intersystems" or not connection._index_builds_after_migrate:
+        return
+    _end_migrate_run(connection)
+    options = connection.settings_dict["OPTIONS"]
+    if options.get("DEFER_INDEX_BUILDS", False):
+        build_pending_indexes(
+            connection, workers=options.get("INDEX_BUILD_WORKERS", 1)
+        )
+
+
+pre_migrate.connect(
+    defer_index_builds_to_post_migrate, dispatch_uid="django_iris_defer_index_builds"
+)
+post_migrate.connect(
+    build_indexes_on_post_migrate, dispatch_uid="django_iris_build_indexes"
+)
 
 
 class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
@@ -33,6 +89,65 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
     )
     sql_create_unique = "CREATE UNIQUE INDEX %(name)s ON %(table)s (%(columns)s)"
 
+    def __init__(self, connection, collect_sql=False, atomic=True):
+        super().__init__(connection, collect_sql, atomic)
+        options = connection.settings_dict["OPTIONS"]
+        # Create non-unique indexes with DEFER, and BUILD INDEX them at the
+        # end of migrate, or when the schema editor exits outside of it
+        self.defer_index_builds = options.get("DEFER_INDEX_BUILDS", False)
+        self.index_build_workers = options.get("INDEX_BUILD_WORKERS", 1)
+        self.deferred_index_tables = set()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            super().__exit__(exc_type, exc_value, traceback)
+        except BaseException:
+            _end_migrate_run(self.connection)
+            raise
+        if exc_type is not None:
+            # A failed migrate sends no post_migrate, later schema editors
+            # build their indexes themselves
+            _end_migrate_run(self.connection)
+        elif (
+            self.deferred_index_tables
+            and not self.connection._index_builds_after_migrate
+        ):
+            build_pending_indexes(
+                self.connection,
+                tables=self.deferred_index_tables,
+                workers=self.index_build_workers,
+            )
+
+    def execute(self, sql, params=()):
+        super().execute(sql, params)
+        # Prepared statements may refer to the old table definition
+        self.connection.statement_handles.clear()
+        self.connection.introspection.invalidate_schema_cache(sql)
+        if isinstance(sql, DeferredIndexStatement) and not self.collect_sql:
+            add_pending_index(self.connection, sql.table_name, sql.index_name)
+            self.deferred_index_tables.add(sql.table_name)
+
+    def _create_index_sql(self, model, *, sql=None, **kwargs):
+        # Unique indexes are built right away, they enforce the constraint
+        if not self.defer_index_builds or sql is not None:
+            return super()._create_index_sql(model, sql=sql, **kwargs)
+        statement = super()._create_index_sql(
+            model, sql=self.sql_create_index + " DEFER", **kwargs
+        )
+        return DeferredIndexStatement(statement.template, **statement.parts)
+
+    def alter_db_table(self, model, old_db_table, new_db_table):
+        super().alter_db_table(model, old_db_table, new_db_table)
+        if (
+            self.defer_index_builds
+            and not self.collect_sql
+            and old_db_table != new_db_table
+        ):
+            rename_pending_indexes(self.connection, old_db_table, new_db_table)
+            if old_db_table in self.deferred_index_tables:
+                self.deferred_index_tables.discard(old_db_table)
+                self.deferred_index_tables.add(new_db_table)
+
     def quote_value(self, value):
         if isinstance(value, bool):
             return str(int(value))
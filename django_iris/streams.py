@@ -0,0 +1,258 @@
+"""
+Lazy access to the stream columns, TEXT and LONG BINARY.
+
+LazyTextField and LazyBinaryField select only a reference to the row, the
+value is a LazyStream, which reads the stream in chunks with SUBSTRING when
+it is accessed. write_stream() uploads a value in chunks, which are
+collected on the server and written to the stream at once.
+"""
+import re
+import threading
+import uuid
+
+from django.db import connections, router
+from django.db.models import BinaryField, F, TextField
+from django.db.models.expressions import Col
+
+from django_iris.introspection import schema_name
+
+_column_re = re.compile(r'^("[^"]+")\.("[^"]+")$')
+
+STREAM_PROCEDURES = (
+    """
+CREATE OR REPLACE PROCEDURE %ZDJANGO.STREAM_APPEND(handle %String, data %String(MAXLEN=""))
+LANGUAGE OBJECTSCRIPT
+{
+	set ^||django.stream(handle, $increment(^||django.stream(handle))) = data
+}""",
+    """
+CREATE OR REPLACE PROCEDURE %ZDJANGO.STREAM_WRITE(handle %String, schemaName %String, tableName %String, columnName %String, pkName %String, pk %String, binary %Integer)
+LANGUAGE OBJECTSCRIPT
+{
+	// The names come from the caller, only existing columns are written to
+	for name = columnName, pkName {
+		set result = ##class(%SQL.Statement).%ExecDirect(, "SELECT 1 FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?", schemaName, tableName, name)
+		if 'result.%Next() {
+			kill ^||django.stream(handle)
+			$$$ThrowStatus($$$ERROR($$$GeneralError, "No column " _ name _ " in " _ schemaName _ "." _ tableName))
+		}
+	}
+
+	set stream = $select(binary: ##class(%Stream.GlobalBinary).%New(), 1: ##class(%Stream.GlobalCharacter).%New())
+	for i=1:1:$get(^||django.stream(handle)) {
+		$$$ThrowOnError(stream.Write(^||django.stream(handle, i)))
+	}
+	kill ^||django.stream(handle)
+
+	// Delimited identifiers, with their double quotes doubled
+	set q = $char(34), names = $listbuild(schemaName, tableName, columnName, pkName)
+	for i=1:1:4 {
+		set quoted(i) = q _ $replace($list(names, i), q, q _ q) _ q
+	}
+	set sql = "UPDATE " _ quoted(1) _ "." _ quoted(2) _ " SET " _ quoted(3) _ " = ? WHERE " _ quoted(4) _ " = ?"
+	set result = ##class(%SQL.Statement).%ExecDirect(, sql, stream, pk)
+	if result.%SQLCODE < 0 {
+		throw ##class(%Exception.SQL).CreateFromSQLCODE(result.%SQLCODE, result.%Message)
+	}
+}""",
+)
+
+# Databases the procedures were created in by this process, by server
+# and namespace
+_installed = set()
+_installed_lock = threading.Lock()
+
+
+def _install_procedures(connection, cursor):
+    settings_dict = connection.settings_dict
+    key = (settings_dict["HOST"], settings_dict["PORT"], settings_dict["NAME"])
+    with _installed_lock:
+        if key in _installed:
+            return
+        for procedure in STREAM_PROCEDURES:
+            cursor.execute(procedure)
+        _installed.add(key)
+
+
+class LazyStream:
+    """
+    File-like read access to the stream column of one row, fetched in
+    chunk_size pieces, only when read.
+    """
+
+    chunk_size = 32000
+
+    def __init__(self, using, field, pk):
+        self.using = using
+        self.field = field
+        self.pk = pk
+        self.binary = isinstance(field, BinaryField)
+        self._position = 1
+        self._buffer = self._empty
+
+    @property
+    def _empty(self):
+        return b"" if self.binary else ""
+
+    def _fetch(self, start, length):
+        connection = connections[self.using]
+        qn = connection.ops.quote_name
+        opts = self.field.model._meta
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT SUBSTRING(%s, %%s, %%s) FROM %s WHERE %s = %%s"
+                % (qn(self.field.column), qn(opts.db_table), qn(opts.pk.column)),
+                [start, length, self.pk],
+            )
+            row = cursor.fetchone()
+        chunk = row[0] if row and row[0] is not None else self._empty
+        if self.binary and isinstance(chunk, str):
+            chunk = chunk.encode("latin-1")
+        return chunk
+
+    def read(self, size=-1):
+        """Read up to size characters, or bytes, all the rest by default."""
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            chunk = self._fetch(self._position, self.chunk_size)
+            if not chunk:
+                break
+            self._position += len(chunk)
+            chunks.append(chunk)
+            length += len(chunk)
+        data = self._empty.join(chunks)
+        if size < 0:
+            size = len(data)
+        data, self._buffer = data[:size], data[size:]
+        return data
+
+    def getvalue(self):
+        """The whole value, regardless of the position of read()."""
+        return LazyStream(self.using, self.field, self.pk).read()
+
+    def readable(self):
+        return True
+
+    def seek(self, offset):
+        """Only absolute positions are supported."""
+        self._position = offset + 1
+        self._buffer = self._empty
+        return offset
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def __repr__(self):
+        return "<%s: %s.%s pk=%r>" % (
+            self.__class__.__name__,
+            self.field.model._meta.db_table,
+            self.field.column,
+            self.pk,
+        )
+
+
+class LazyStreamMixin:
+    def select_format(self, compiler, sql, params):
+        # The primary key of the row, NULL for a NULL stream
+        match = _column_re.match(sql)
+        if match is None:
+            return super().select_format(compiler, sql, params)
+        pk = compiler.connection.ops.quote_name(self.model._meta.pk.column)
+        return (
+            "CASE WHEN %s IS NULL THEN NULL ELSE %s.%s END" % (sql, match[1], pk),
+            params,
+        )
+
+    def from_db_value(self, value, expression, connection):
+        if value is None or not (
+            isinstance(expression, Col) and expression.target is self
+        ):
+            return value
+        return LazyStream(connection.alias, self, value)
+
+    def value_from_object(self, obj):
+        value = super().value_from_object(obj)
+        if isinstance(value, LazyStream):
+            value = value.getvalue()
+        return value
+
+    def to_python(self, value):
+        if isinstance(value, LazyStream):
+            value = value.getvalue()
+        return super().to_python(value)
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if (
+            not add
+            and isinstance(value, LazyStream)
+            and value.field is self
+            and value.pk == model_instance.pk
+            and value.using == model_instance._state.db
+        ):
+            # The stream of this very row, the UPDATE leaves it as it is
+            return F(self.attname)
+        return value
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        # Inserting the row, or a stream of another row, writes all of it
+        if isinstance(value, LazyStream):
+            value = value.getvalue()
+        return super().get_db_prep_value(value, connection, prepared)
+
+
+class LazyTextField(LazyStreamMixin, TextField):
+    pass
+
+
+class LazyBinaryField(LazyStreamMixin, BinaryField):
+    pass
+
+
+def write_stream(instance, field_name, data, using=None, chunk_size=None):
+    """
+    Write data, str/bytes, an iterable of them, or a file object, to the
+    stream field of a saved instance, sending it chunk by chunk.
+
+    The chunks are collected in process-private globals of the server
+    process, and written to the stream in one UPDATE at the end.
+    """
+    field = instance._meta.get_field(field_name)
+    using = using or router.db_for_write(instance.__class__, instance=instance)
+    connection = connections[using]
+    chunk_size = chunk_size or LazyStream.chunk_size
+    binary = isinstance(field, BinaryField)
+    if isinstance(data, (str, bytes)):
+        data = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+    elif hasattr(data, "read"):
+        source = data
+        data = iter(lambda: source.read(chunk_size), b"" if binary else "")
+
+    opts = field.model._meta
+    schema, table = schema_name(opts.db_table)
+    handle = uuid.uuid4().hex
+    with connection.cursor() as cursor:
+        _install_procedures(connection, cursor)
+        for chunk in data:
+            if chunk:
+                cursor.execute(
+                    "CALL %%ZDJANGO.STREAM_APPEND(%s, %s)", [handle, chunk]
+                )
+        cursor.execute(
+            "CALL %%ZDJANGO.STREAM_WRITE(%s, %s, %s, %s, %s, %s, %s)",
+            [
+                handle,
+                schema,
+                table,
+                field.column,
+                opts.pk.column,
+                instance.pk,
+                int(binary),
+            ],
+        )
+    setattr(instance, field.attname, LazyStream(using, field, instance.pk))
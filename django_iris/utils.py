@@ -1,29 +1,55 @@
+import threading
+from collections import OrderedDict
 
-class BulkInsertMapper:
-    BLOB = "%s"
-    DATE = "CAST(%s AS DATE)"
-    INTERVAL = "%s"
-    NCLOB = "%s"
-    NUMBER = "%s"
-    TIMESTAMP = "CAST(%s AS TIMESTAMP)"
-
-    types = {
-        "AutoField": NUMBER,
-        "BigAutoField": NUMBER,
-        "BigIntegerField": NUMBER,
-        "BinaryField": BLOB,
-        "BooleanField": NUMBER,
-        "DateField": DATE,
-        "DateTimeField": TIMESTAMP,
-        "DecimalField": NUMBER,
-        "DurationField": INTERVAL,
-        "FloatField": NUMBER,
-        "IntegerField": NUMBER,
-        "PositiveBigIntegerField": NUMBER,
-        "PositiveIntegerField": NUMBER,
-        "PositiveSmallIntegerField": NUMBER,
-        "SmallAutoField": NUMBER,
-        "SmallIntegerField": NUMBER,
-        "TextField": NCLOB,
-        "TimeField": TIMESTAMP,
-    }
+
+class LRUCache:
+    """
+    Bounded, thread-safe LRU mapping with hit/miss/eviction counters.
+    A maxsize of 0 disables caching.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,83 @@
+import django
+import pytest
+from django.conf import settings
+
+import stub_dbapi
+
+# Unit tests run against the recording stand-in, not an IRIS server
+stub_dbapi.install()
+
+
+def pytest_configure():
+    settings.configure(
+        DATABASES={
+            "default": {
+                "ENGINE": "django_iris",
+                "NAME": "USER",
+                "USER": "_SYSTEM",
+                "PASSWORD": "SYS",
+                "HOST": "localhost",
+                "PORT": 1972,
+                "OPTIONS": {
+                    "LIMIT_OFFSET": False,
+                    "PREPARED_STATEMENT_CACHE_SIZE": 0,
+                },
+            },
+        },
+        INSTALLED_APPS=["testapp"],
+        USE_TZ=False,
+    )
+    django.setup()
+
+
+@pytest.fixture(autouse=True)
+def stub_connections():
+    """The driver connections made during the test."""
+    yield stub_dbapi.opened
+    stub_dbapi.opened.clear()
+    stub_dbapi.default_responses.clear()
+
+
+@pytest.fixture
+def connection():
+    from django.db import connections
+
+    connection = connections["default"]
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def stub(connection):
+    """The driver connection of the default database, with an empty log."""
+    connection.ensure_connection()
+    connection.connection.log.clear()
+    return connection.connection
+
+
+@pytest.fixture
+def connection_with():
+    """
+    connection_with(**OPTIONS) makes a new default database connection with
+    these OPTIONS for the rest of the test.
+    """
+    from django.db import connections
+
+    original = connections["default"]
+    created = []
+
+    def make(**options):
+        settings_dict = {
+            **original.settings_dict,
+            "OPTIONS": {**original.settings_dict["OPTIONS"], **options},
+            "TEST": {**original.settings_dict["TEST"]},
+        }
+        connection = type(original)(settings_dict, "default")
+        connections["default"] = connection
+        created.append(connection)
+        return connection
+
+    yield make
+    for connection in created:
+        connection.close()
+    connections["default"] = original
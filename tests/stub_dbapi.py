@@ -0,0 +1,185 @@
+"""
+Recording stand-in for the intersystems_iris DB-API driver.
+
+Every execute(), executemany() and fetch is logged on the connection, and
+SELECT results come from the rows registered with StubConnection.respond().
+"""
+
+import re
+import sys
+import types
+
+Binary = bytes
+
+
+class Warning(Exception):
+    pass
+
+
+class Error(Exception):
+    pass
+
+
+class InterfaceError(Error):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class DataError(DatabaseError):
+    pass
+
+
+class OperationalError(DatabaseError):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    pass
+
+
+class InternalError(DatabaseError):
+    pass
+
+
+class ProgrammingError(DatabaseError):
+    pass
+
+
+class NotSupportedError(DatabaseError):
+    pass
+
+
+class StubCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.arraysize = 1
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self.closed = False
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        params = list(params or ())
+        self.connection.log.append(("execute", sql, params))
+        self._result(sql, [params])
+
+    def executemany(self, sql, seq_of_params):
+        rows = [list(params) for params in seq_of_params]
+        self.connection.log.append(("executemany", sql, rows))
+        self._result(sql, rows)
+
+    def _result(self, sql, param_rows):
+        self._rows = []
+        self.description = None
+        for pattern, rows in self.connection.responses:
+            if re.search(pattern, sql):
+                if callable(rows):
+                    # Called for every row, it may raise a driver error
+                    result = []
+                    for params in param_rows:
+                        result = rows(sql, params)
+                    rows = result
+                self._rows = [tuple(row) for row in rows]
+                break
+        if re.match(r"\s*INSERT\b", sql, re.IGNORECASE):
+            for _ in param_rows:
+                self.connection.last_id += 1
+            self.lastrowid = self.connection.last_id
+            self.rowcount = len(param_rows)
+            return
+        if re.match(r"\s*(SELECT|EXPLAIN)\b", sql, re.IGNORECASE):
+            width = len(self._rows[0]) if self._rows else 1
+            self.description = [("col%d" % i,) + (None,) * 6 for i in range(width)]
+        self.rowcount = len(self._rows)
+
+    def fetchone(self):
+        self.connection.log.append(("fetchone", None, None))
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        self.connection.log.append(("fetchmany", size, None))
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self):
+        self.connection.log.append(("fetchall", None, None))
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        while self._rows:
+            yield self._rows.pop(0)
+
+
+# Every connection made, and the responses each one starts with
+opened = []
+default_responses = []
+
+
+class StubConnection:
+    def __init__(self, **params):
+        self.params = params
+        self.log = []
+        self.responses = list(default_responses)
+        self.cursors = []
+        self.last_id = 0
+        self.autocommit = params.get("autoCommit")
+        self.closed = False
+
+    def respond(self, pattern, rows):
+        """Rows, or a callable(sql, params) returning them, for matching SQL."""
+        self.responses.insert(0, (pattern, rows))
+
+    def statements(self, kind=None):
+        return [
+            (entry[1], entry[2])
+            for entry in self.log
+            if entry[0] in ("execute", "executemany") and kind in (None, entry[0])
+        ]
+
+    def cursor(self):
+        cursor = StubCursor(self)
+        self.cursors.append(cursor)
+        return cursor
+
+    def setAutoCommit(self, autocommit):
+        self.autocommit = autocommit
+
+    def commit(self):
+        self.log.append(("commit", None, None))
+
+    def rollback(self):
+        self.log.append(("rollback", None, None))
+
+    def close(self):
+        self.closed = True
+
+
+def connect(**params):
+    connection = StubConnection(**params)
+    opened.append(connection)
+    return connection
+
+
+def install():
+    """Register this module as intersystems_iris.dbapi._DBAPI."""
+    module = sys.modules[__name__]
+    for name in ("intersystems_iris", "intersystems_iris.dbapi"):
+        sys.modules.setdefault(name, types.ModuleType(name))
+    sys.modules["intersystems_iris"].dbapi = sys.modules["intersystems_iris.dbapi"]
+    sys.modules["intersystems_iris.dbapi"]._DBAPI = module
+    sys.modules["intersystems_iris.dbapi._DBAPI"] = module
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+
+from django.db import connections
+from testapp.models import Book
+
+from django_iris.aio import AsyncConnection
+
+
+def respond_books(count):
+    stub = connections["default"].connection
+    stub.respond(
+        r'FROM "testapp_book"',
+        [(pk, "t%d" % pk, None, None, 0, None, None) for pk in range(1, count + 1)],
+    )
+
+
+def test_calls_run_on_one_thread_and_connection():
+    async def main():
+        async with AsyncConnection() as conn:
+            first = await conn.run(
+                lambda: (threading.get_ident(), connections["default"])
+            )
+            second = await conn.run(
+                lambda: (threading.get_ident(), connections["default"])
+            )
+            return first, second
+
+    first, second = asyncio.run(main())
+    assert first == second
+    assert first[0] != threading.get_ident()
+
+
+def respond_book(pk):
+    stub = connections["default"].connection
+    stub.respond(
+        r'WHERE "testapp_book"."id" = \?', [(pk, "t", None, None, 0, None, None)]
+    )
+
+
+def test_queries_run_on_the_connection_thread():
+    async def main():
+        async with AsyncConnection() as conn:
+            await conn.run(lambda: connections["default"].ensure_connection())
+            await conn.run(respond_books, 3)
+            await conn.run(respond_book, 1)
+            count = len(await conn.fetch(Book.objects.all()))
+            book = await conn.get(Book.objects.filter(pk=1))
+            rows = await conn.execute('SELECT "title" FROM "testapp_book"')
+            return count, book, rows
+
+    count, book, rows = asyncio.run(main())
+    assert count == 3
+    assert book.pk == 1
+    assert len(rows) == 3
+
+
+def test_iterator_prefetches_next_chunk():
+    async def main():
+        async with AsyncConnection() as conn:
+            await conn.run(lambda: connections["default"].ensure_connection())
+            await conn.run(respond_books, 5)
+            return [
+                book.pk
+                async for book in conn.iterator(Book.objects.all(), chunk_size=2)
+            ]
+
+    assert asyncio.run(main()) == [1, 2, 3, 4, 5]
+
+
+def test_queries_in_flight_are_limited(monkeypatch):
+    monkeypatch.setitem(
+        connections.settings["default"]["OPTIONS"], "ASYNC_MAX_IN_FLIGHT", 2
+    )
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def slow():
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    async def main():
+        conns = [AsyncConnection() for _ in range(5)]
+        try:
+            await asyncio.gather(*(conn.run(slow) for conn in conns))
+        finally:
+            await asyncio.gather(*(conn.close() for conn in conns))
+
+    asyncio.run(main())
+    assert running[1] == 2
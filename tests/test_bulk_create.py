@@ -0,0 +1,74 @@
+import pytest
+from testapp.models import Book
+
+INSERT = (
+    'INSERT INTO "testapp_book" ("title", "subtitle", "author_id", "pages", '
+    '"rating", "published") VALUES (?, ?, ?, ?, ?, ?)'
+)
+
+
+def books(count):
+    return [Book(title="book %d" % n, pages=n) for n in range(count)]
+
+
+@pytest.fixture
+def executemany(connection_with):
+    connection = connection_with(BULK_CREATE_RETURNING=False)
+    connection.ensure_connection()
+    return connection.connection
+
+
+def test_batch_is_one_executemany(executemany):
+    Book.objects.bulk_create(books(5))
+    assert executemany.statements() == [
+        (INSERT, [["book %d" % n, None, None, n, None, None] for n in range(5)])
+    ]
+    assert executemany.statements("execute") == []
+
+
+def test_batches(executemany):
+    Book.objects.bulk_create(books(5), batch_size=2)
+    # A single row left in the last batch goes through execute()
+    assert [
+        (kind, len(params) if kind == "executemany" else 1)
+        for kind, _, params in executemany.log
+        if kind in ("execute", "executemany")
+    ] == [("executemany", 2), ("executemany", 2), ("execute", 1)]
+
+
+def test_batch_size_by_query_params(connection):
+    fields = [field for field in Book._meta.concrete_fields if not field.primary_key]
+    objs = books(3)
+    max_params = connection.features.max_query_params
+    assert connection.ops.bulk_batch_size(fields, objs) == max_params // 6
+    assert connection.ops.bulk_batch_size([], objs) == 3
+
+
+def test_primary_keys_are_not_set_by_default(connection, stub):
+    assert connection.features.can_return_rows_from_bulk_insert is False
+    created = Book.objects.bulk_create(books(3))
+    assert [book.pk for book in created] == [None, None, None]
+    assert len(stub.statements("executemany")) == 1
+
+
+@pytest.fixture
+def returning(connection_with):
+    connection = connection_with(BULK_CREATE_RETURNING=True)
+    connection.ensure_connection()
+    return connection.connection
+
+
+def test_returning_sets_primary_keys_in_row_order(returning):
+    returning.last_id = 100
+    created = Book.objects.bulk_create(books(5), batch_size=2)
+    assert [book.pk for book in created] == [101, 102, 103, 104, 105]
+    assert [book.title for book in created] == ["book %d" % n for n in range(5)]
+
+
+def test_returning_round_trips(returning):
+    Book.objects.bulk_create(books(5), batch_size=2)
+    # One execute() per row, on the same statement text
+    assert returning.statements("executemany") == []
+    statements = returning.statements("execute")
+    assert [sql for sql, _ in statements] == [INSERT] * 5
+    assert [params[0] for _, params in statements] == ["book %d" % n for n in range(5)]
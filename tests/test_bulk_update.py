@@ -0,0 +1,113 @@
+import pytest
+from django.db.models import F
+from testapp.models import Book, Novel
+
+from django_iris.bulk import bulk_update
+
+UPDATE = 'UPDATE "testapp_book" SET "pages" = ?, "rating" = ? WHERE "id" = ?'
+
+
+def books(count):
+    return [
+        Book(id=n + 1, title="book %d" % n, pages=n, rating=n % 5) for n in range(count)
+    ]
+
+
+def executed(stub):
+    return [
+        (kind, sql, params)
+        for kind, sql, params in stub.log
+        if kind in ("execute", "executemany")
+    ]
+
+
+def test_one_executemany(stub):
+    bulk_update(Book.objects.all(), books(3), ["pages", "rating"])
+    assert executed(stub) == [
+        ("executemany", UPDATE, [[0, 0, 1], [1, 1, 2], [2, 2, 3]])
+    ]
+
+
+def test_batch_size(stub):
+    bulk_update(Book.objects.all(), books(5), ["pages", "rating"], batch_size=2)
+    assert [(kind, sql, len(params)) for kind, sql, params in executed(stub)] == [
+        ("executemany", UPDATE, 2),
+        ("executemany", UPDATE, 2),
+        ("executemany", UPDATE, 1),
+    ]
+
+
+def test_returns_rows_matched(stub):
+    # The stub reports one row affected per row it returns
+    stub.respond(r"^UPDATE", [(1,), (1,)])
+    assert bulk_update(Book.objects.all(), books(5), ["pages"], batch_size=2) == 6
+
+
+def test_nocheck_while_constraint_checking_is_disabled(connection, stub):
+    with connection.constraint_checks_disabled():
+        bulk_update(Book.objects.all(), books(1), ["pages", "rating"])
+    assert [sql for _, sql, _ in executed(stub)] == [
+        'UPDATE %NOCHECK "testapp_book" SET "pages" = ?, "rating" = ? WHERE "id" = ?'
+    ]
+
+
+def test_no_objects(stub):
+    assert bulk_update(Book.objects.all(), [], ["pages"]) == 0
+    assert executed(stub) == []
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"fields": []}, "Field names must be given"),
+        ({"fields": ["id"]}, "primary key fields"),
+        ({"fields": ["pages"], "batch_size": 0}, "positive integer"),
+    ],
+)
+def test_invalid_arguments(stub, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        bulk_update(Book.objects.all(), books(1), **kwargs)
+
+
+def test_expressions_fall_back_to_case_when(stub):
+    objs = books(2)
+    objs[0].pages = F("pages") + 1
+    bulk_update(Book.objects.all(), objs, ["pages"])
+    assert [kind for kind, _, _ in executed(stub)] == ["execute"]
+    assert "CASE WHEN" in executed(stub)[0][1]
+
+
+def test_filtered_queryset_falls_back_to_case_when(stub):
+    bulk_update(Book.objects.filter(rating__gt=1), books(2), ["pages"])
+    ((kind, sql, _),) = executed(stub)
+    assert kind == "execute"
+    assert "CASE WHEN" in sql and '"rating" > ?' in sql
+
+
+def test_parent_model_fields_fall_back_to_case_when(stub):
+    novels = [
+        Novel(id=n + 1, book_ptr_id=n + 1, title="novel", genre="sf") for n in range(2)
+    ]
+    # Django looks up the rows before updating both tables
+    stub.respond(r'^SELECT "testapp_novel"."book_ptr_id"', [(1,), (2,)])
+    Novel.objects.bulk_update(novels, ["title", "genre"])
+    updates = [sql for _, sql, _ in executed(stub) if sql.startswith("UPDATE")]
+    assert [sql.split(" SET ")[0] for sql in updates] == [
+        'UPDATE "testapp_novel"',
+        'UPDATE "testapp_book"',
+    ]
+    assert all("CASE WHEN" in sql for sql in updates)
+
+
+def test_own_fields_through_the_queryset_mixin(stub):
+    novels = [
+        Novel(id=n + 1, book_ptr_id=n + 1, title="novel", genre="sf") for n in range(2)
+    ]
+    Novel.objects.bulk_update(novels, ["genre"])
+    assert executed(stub) == [
+        (
+            "executemany",
+            'UPDATE "testapp_novel" SET "genre" = ? WHERE "book_ptr_id" = ?',
+            [["sf", 1], ["sf", 2]],
+        )
+    ]
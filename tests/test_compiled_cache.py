@@ -0,0 +1,44 @@
+import pytest
+from django.db.models import F
+from testapp.models import Book
+
+
+@pytest.fixture
+def cached(connection_with):
+    connection = connection_with(COMPILED_SQL_CACHE_SIZE=16)
+    connection.ensure_connection()
+    return connection
+
+
+def sql(queryset):
+    return queryset.query.get_compiler("default").as_sql()
+
+
+def test_same_shape_is_reused(cached):
+    first = sql(Book.objects.filter(pages__gt=10))
+    second = sql(Book.objects.filter(pages__gt=20))
+    assert first[0] == second[0]
+    assert (first[1], second[1]) == ((10,), (20,))
+    assert cached.compiled_cache.hits == 1
+
+
+def test_unselected_annotations_are_part_of_the_key(cached):
+    by_pages, _ = sql(Book.objects.alias(x=F("pages")).order_by("x"))
+    by_rating, _ = sql(Book.objects.alias(x=F("rating")).order_by("x"))
+    assert by_pages.endswith('ORDER BY "testapp_book"."pages" ASC')
+    assert by_rating.endswith('ORDER BY "testapp_book"."rating" ASC')
+
+
+def test_unselected_annotation_filter(cached):
+    query, params = sql(Book.objects.alias(x=F("rating")).filter(x__gt=3))
+    assert '"testapp_book"."rating" > %s' in query
+    assert params == (3,)
+    query, params = sql(Book.objects.alias(x=F("pages")).filter(x__gt=3))
+    assert '"testapp_book"."pages" > %s' in query
+
+
+def test_selected_and_unselected_annotations_differ(cached):
+    aliased, _ = sql(Book.objects.alias(x=F("pages")).order_by("x"))
+    annotated, _ = sql(Book.objects.annotate(x=F("pages")).order_by("x"))
+    assert aliased != annotated
+    assert '"testapp_book"."pages" AS "x"' in annotated
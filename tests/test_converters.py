@@ -0,0 +1,134 @@
+from datetime import date, datetime, time, timezone
+
+import pytest
+from testapp.models import Book
+
+from django_iris.converters import (
+    POSIX_NEGATIVE_OFFSET,
+    POSIX_POSITIVE_OFFSET,
+    booleanfield_converter,
+    datefield_converter,
+    datetimefield_converter,
+    timefield_converter,
+)
+
+# 2024-01-01 in $HOROLOG days, 12:30:15 in seconds of the day
+HOROLOG_DATE = 66840
+HOROLOG_TIME = 12 * 3600 + 30 * 60 + 15
+
+
+def convert(converter, *values):
+    return [converter(value, None, None) for value in values]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (POSIX_POSITIVE_OFFSET + 1500000, datetime.fromtimestamp(1.5)),
+        (POSIX_NEGATIVE_OFFSET - 1000000, datetime.fromtimestamp(-1)),
+        ("2024-01-01 12:30:15", datetime(2024, 1, 1, 12, 30, 15)),
+        ("", ""),
+        (datetime(2024, 1, 1), datetime(2024, 1, 1)),
+        (None, None),
+    ],
+)
+def test_datetime(value, expected):
+    assert convert(datetimefield_converter(False, None), value) == [expected]
+
+
+def test_datetime_with_use_tz():
+    converter = datetimefield_converter(True, timezone.utc)
+    aware = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert convert(converter, "2024-01-01 00:00:00", aware.replace(tzinfo=None)) == [
+        aware,
+        aware,
+    ]
+    # Values already aware, and empty strings, are left as they are
+    other = datetime(2024, 1, 1, tzinfo=timezone.max)
+    assert convert(converter, other, "", None) == [other, "", None]
+
+
+def test_datetime_without_use_tz_stays_naive():
+    converter = datetimefield_converter(False, timezone.utc)
+    assert convert(converter, "2024-01-01 00:00:00") == [datetime(2024, 1, 1)]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (0, date(1840, 12, 31)),
+        (HOROLOG_DATE, date(2024, 1, 1)),
+        ("2024-01-01", date(2024, 1, 1)),
+        # Logical values may come back as strings too
+        (str(HOROLOG_DATE), date(2024, 1, 1)),
+        (date(2024, 1, 1), date(2024, 1, 1)),
+        (None, None),
+    ],
+)
+def test_date(value, expected):
+    assert convert(datefield_converter(), value) == [expected]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (0, time(0, 0)),
+        (HOROLOG_TIME, time(12, 30, 15)),
+        ("12:30:15", time(12, 30, 15)),
+        (str(HOROLOG_TIME), time(12, 30, 15)),
+        (time(12, 30, 15), time(12, 30, 15)),
+        (None, None),
+    ],
+)
+def test_time(value, expected):
+    assert convert(timefield_converter(), value) == [expected]
+
+
+def test_wire_type_switch_within_a_column():
+    # The decoder is picked again when the type of the values changes
+    assert convert(
+        datefield_converter(),
+        HOROLOG_DATE,
+        None,
+        "2024-01-02",
+        HOROLOG_DATE + 2,
+        date(2024, 1, 4),
+    ) == [
+        date(2024, 1, 1),
+        None,
+        date(2024, 1, 2),
+        date(2024, 1, 3),
+        date(2024, 1, 4),
+    ]
+    assert convert(
+        datetimefield_converter(False, None),
+        "2024-01-01 00:00:00",
+        POSIX_POSITIVE_OFFSET,
+        "2024-01-02 00:00:00",
+    ) == [datetime(2024, 1, 1), datetime.fromtimestamp(0), datetime(2024, 1, 2)]
+
+
+def test_unknown_wire_type():
+    assert convert(datefield_converter(), float(HOROLOG_DATE)) == [date(2024, 1, 1)]
+    assert convert(timefield_converter(), float(HOROLOG_TIME)) == [time(12, 30, 15)]
+    assert convert(datetimefield_converter(False, None), 1.5) == [1.5]
+
+
+@pytest.mark.parametrize(
+    "value, expected", [(0, False), (1, True), (None, None), ("x", "x")]
+)
+def test_boolean(value, expected):
+    result = booleanfield_converter(value, None, None)
+    assert result == expected and type(result) is type(expected)
+
+
+def test_selected_columns_are_converted(stub):
+    stub.respond(
+        r'^SELECT "testapp_book"."published"',
+        [(POSIX_POSITIVE_OFFSET,), ("2024-01-01 12:30:15",), (None,)],
+    )
+    assert list(Book.objects.values_list("published", flat=True)) == [
+        datetime.fromtimestamp(0),
+        datetime(2024, 1, 1, 12, 30, 15),
+        None,
+    ]
@@ -0,0 +1,214 @@
+import re
+import types
+
+import pytest
+
+import stub_dbapi
+from django_iris import creation as creation_module
+
+
+@pytest.fixture
+def pooled(connection_with):
+    connection = connection_with(POOL={"MIN_SIZE": 0, "MAX_SIZE": 2})
+    yield connection
+    connection.close()
+    connection.close_pool()
+
+
+def namespace(connection):
+    connection.ensure_connection()
+    return connection.connection.params["namespace"]
+
+
+def test_pool_follows_test_database_name(pooled):
+    assert namespace(pooled) == "USER"
+    pooled.close()
+    pooled.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        assert namespace(pooled) == "test_USER"
+    finally:
+        pooled.creation.destroy_test_db("USER", verbosity=0)
+    assert namespace(pooled) == "USER"
+
+
+def pooled_driver_connection(connection):
+    connection.ensure_connection()
+    driver = connection.connection
+    connection.close()
+    assert not driver.closed
+    return driver
+
+
+def test_clone_closes_pooled_connections(pooled):
+    driver = pooled_driver_connection(pooled)
+    pooled.creation._clone_test_db("1", verbosity=0)
+    # No connection to the source database is left open while it's copied
+    assert driver.closed
+    assert "default" not in pooled._connection_pools
+
+
+def test_destroy_closes_pooled_connections(pooled):
+    pooled.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    driver = pooled_driver_connection(pooled)
+    pooled.creation.destroy_test_db("USER", verbosity=0)
+    assert driver.closed
+    assert namespace(pooled) == "USER"
+
+
+def test_worker_connects_to_its_clone(pooled):
+    assert namespace(pooled) == "USER"
+    original = dict(pooled.settings_dict)
+    try:
+        pooled.creation.setup_worker_connection(2)
+        assert namespace(pooled) == "USER_2"
+    finally:
+        pooled.close()
+        pooled.settings_dict.update(original)
+
+
+@pytest.fixture
+def snapshots(connection_with, stub_connections):
+    """
+    A default database with TEST["SNAPSHOT"], with namespaces.add(name)
+    making a namespace exist.
+    """
+    connection = connection_with()
+    connection.settings_dict["TEST"]["SNAPSHOT"] = True
+    namespaces = set()
+
+    def exists(sql, params):
+        return [(int(params[0] in namespaces),)]
+
+    def listed(sql, params):
+        return [(",".join(sorted(n for n in namespaces if n.startswith(params[0]))),)]
+
+    stub_dbapi.default_responses.extend(
+        [
+            (r"^SELECT %ZDJANGO\.NAMESPACE_EXISTS\(", exists),
+            (r"^SELECT %ZDJANGO\.NAMESPACES\(", listed),
+        ]
+    )
+    connection.namespaces = namespaces
+    yield connection
+    if connection.settings_dict["NAME"] != "USER":
+        connection.creation.destroy_test_db("USER", verbosity=0)
+
+
+def statements(stub_connections, pattern):
+    return [
+        (sql, params)
+        for driver in stub_connections
+        for sql, params in driver.statements()
+        if re.match(pattern, sql)
+    ]
+
+
+def test_snapshot_is_taken(snapshots, stub_connections):
+    snapshot = snapshots.creation._snapshot_name()
+    snapshots.namespaces.add("test_USER_SNAPSHOT_0123456789AB")
+    snapshots.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    assert statements(stub_connections, r"(CREATE|DROP) DATABASE|CALL") == [
+        ('CREATE DATABASE "test_USER" ', []),
+        # Snapshots of other migration states are dropped
+        ('DROP DATABASE "test_USER_SNAPSHOT_0123456789AB"', []),
+        ('CREATE DATABASE "%s"' % snapshot, []),
+        ("CALL %ZDJANGO.CLONE_DATABASE(?, ?)", ["test_USER", snapshot]),
+    ]
+
+
+def test_snapshot_is_restored(snapshots, stub_connections):
+    snapshot = snapshots.creation._snapshot_name()
+    snapshots.namespaces.add(snapshot)
+    snapshots.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    assert statements(stub_connections, r"(CREATE|DROP) DATABASE|CALL") == [
+        ('CREATE DATABASE "test_USER" ', []),
+        ("CALL %ZDJANGO.CLONE_DATABASE(?, ?)", [snapshot, "test_USER"]),
+    ]
+
+
+def test_kept_database_is_reused(snapshots, stub_connections):
+    snapshots.namespaces.add("test_USER")
+    snapshots.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=True
+    )
+    assert statements(stub_connections, r"(CREATE|DROP) DATABASE|CALL") == []
+
+
+def test_without_snapshot(connection_with, stub_connections):
+    connection = connection_with()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    connection.creation.destroy_test_db("USER", verbosity=0)
+    assert statements(stub_connections, r"(CREATE|DROP) DATABASE|CALL") == [
+        ('CREATE DATABASE "test_USER" ', []),
+        ('DROP DATABASE "test_USER"', []),
+    ]
+
+
+def test_concurrent_clones(connection_with, stub_connections):
+    connection = connection_with()
+    creation = connection.creation
+    creation.concurrent_clones = 3
+    creation._clone_test_db("1", verbosity=0)
+    creation._clone_test_db("2", verbosity=0)
+    creation._clone_test_db("3", verbosity=0)
+    created = statements(stub_connections, r"CREATE DATABASE")
+    cloned = statements(stub_connections, r"CALL")
+    # All at once, by the first call
+    assert sorted(sql for sql, _ in created) == [
+        "CREATE DATABASE USER_1",
+        "CREATE DATABASE USER_2",
+        "CREATE DATABASE USER_3",
+    ]
+    assert sorted(sql for sql, _ in cloned) == [
+        "CALL %%ZDJANGO.CLONE_DATABASE('USER', 'USER_%d')" % n for n in (1, 2, 3)
+    ]
+
+
+def test_clone_outside_of_the_workers(connection_with, stub_connections):
+    creation = connection_with().creation
+    creation.concurrent_clones = 2
+    creation._clone_test_db("5", verbosity=0)
+    assert [sql for sql, _ in statements(stub_connections, r"CREATE DATABASE")] == [
+        "CREATE DATABASE USER_5"
+    ]
+
+
+class Migration:
+    """This module stands for the migration file."""
+
+
+class FakeLoader:
+    """The testapp with one migration."""
+
+    def __init__(self, *args, **kwargs):
+        self.graph = types.SimpleNamespace(
+            nodes={("testapp", "0001_initial"): Migration()}
+        )
+        self.unmigrated_apps = set()
+
+
+def test_hash_with_migrations(connection, monkeypatch):
+    monkeypatch.setattr(creation_module, "MigrationLoader", FakeLoader)
+    read = []
+    monkeypatch.setattr(creation_module, "open", reading(read), raising=False)
+    creation_module.migration_hash(connection)
+    # Models of migrated apps are not part of it
+    assert not any(name.endswith("testapp/models.py") for name in read)
+
+
+def test_hash_without_migrate_covers_all_models(connection, monkeypatch):
+    monkeypatch.setattr(creation_module, "MigrationLoader", FakeLoader)
+    with_migrations = creation_module.migration_hash(connection)
+    monkeypatch.setitem(connection.settings_dict["TEST"], "MIGRATE", False)
+    read = []
+    monkeypatch.setattr(creation_module, "open", reading(read), raising=False)
+    assert creation_module.migration_hash(connection) != with_migrations
+    assert any(name.endswith("testapp/models.py") for name in read)
+
+
+def reading(read):
+    def open_file(filename, mode="r"):
+        read.append(filename)
+        return open(filename, mode)
+
+    return open_file
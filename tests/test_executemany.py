@@ -0,0 +1,82 @@
+import pytest
+from django.db import IntegrityError
+
+import stub_dbapi
+
+INSERT = 'INSERT INTO "testapp_tag" ("slug", "label", "uses") VALUES (%s, %s, %s)'
+
+
+@pytest.fixture
+def batches_of_2(connection_with):
+    connection = connection_with(EXECUTEMANY_BATCH_SIZE=2)
+    connection.ensure_connection()
+    return connection
+
+
+def driver_calls(connection):
+    return [
+        [params[0] for params in rows]
+        for kind, _, rows in connection.connection.log
+        if kind == "executemany"
+    ]
+
+
+def tag_rows(count, produced):
+    for n in range(count):
+        produced.append(n)
+        yield ["tag%d" % n, "Tag %d" % n, n]
+
+
+def test_generator_is_sent_in_batches(batches_of_2):
+    produced = []
+    sent = []
+    # How many rows the generator had produced when each batch was sent
+    batches_of_2.connection.respond(
+        r"^INSERT", lambda sql, params: sent.append(len(produced)) or []
+    )
+    with batches_of_2.cursor() as cursor:
+        cursor.executemany(INSERT, tag_rows(5, produced))
+        assert cursor.rowcount == 5
+    assert driver_calls(batches_of_2) == [["tag0", "tag1"], ["tag2", "tag3"], ["tag4"]]
+    assert sent == [2, 2, 4, 4, 5]
+
+
+def test_rowcount_is_summed_over_batches(batches_of_2):
+    batches_of_2.connection.respond(r"^UPDATE", [(1,)])
+    with batches_of_2.cursor() as cursor:
+        cursor.executemany(
+            'UPDATE "testapp_tag" SET "uses" = %s WHERE "id" = %s',
+            ([n, n] for n in range(5)),
+        )
+        # One row reported per driver call
+        assert cursor.rowcount == 3
+
+
+def test_no_rows(batches_of_2):
+    with batches_of_2.cursor() as cursor:
+        cursor.executemany(INSERT, iter(()))
+        assert cursor.rowcount == 0
+    assert driver_calls(batches_of_2) == []
+
+
+def test_without_batch_size(connection_with):
+    connection = connection_with(EXECUTEMANY_BATCH_SIZE=0)
+    with connection.cursor() as cursor:
+        cursor.executemany(INSERT, tag_rows(5, []))
+        assert cursor.rowcount == 5
+    assert len(driver_calls(connection)) == 1
+
+
+def test_driver_errors_stop_the_batches(batches_of_2):
+    def fail_on_tag2(sql, params):
+        if params[0] == "tag2":
+            raise stub_dbapi.IntegrityError("[SQLCODE: <-119>:<UNIQUE>]")
+        return []
+
+    batches_of_2.connection.respond(r"^INSERT", fail_on_tag2)
+    produced = []
+    with pytest.raises(IntegrityError):
+        with batches_of_2.cursor() as cursor:
+            cursor.executemany(INSERT, tag_rows(5, produced))
+    assert driver_calls(batches_of_2) == [["tag0", "tag1"], ["tag2", "tag3"]]
+    assert produced == [0, 1, 2, 3]
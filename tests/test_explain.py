@@ -0,0 +1,133 @@
+import json
+
+import pytest
+from testapp.models import Book
+
+from django_iris.explain import explain, parse_plans
+
+PLAN = """
+<plan>
+<sql>
+ SELECT "testapp_book"."id" FROM "testapp_book"
+ WHERE "testapp_book"."title" LIKE ?
+</sql>
+<cost value="1342"/>
+Read index map testapp.Book.TitleIdx, using the given %SQLUPPER(title), and looping on ID.
+For each row:
+ Read master map testapp.Book.IDKEY, using the given idkey value.
+ Output the row.
+</plan>
+"""
+
+ALT_PLANS = """
+<plans>
+<plan>
+<sql>SELECT * FROM "testapp_book" WHERE "pages" &gt; ?</sql>
+<cost value="245000"/>
+Divide extent bitmap testapp.Book.%%DDLBEIndex into subranges of IDs.
+Call module B in parallel on each subrange, piping results into temp-file A.
+<module name="B">
+Read bitmap index map testapp.Book.PagesIdx, looping on ID.
+Read master map testapp.Book.IDKEY, using the given idkey value.
+</module>
+</plan>
+<plan>
+<sql>SELECT * FROM "testapp_book" WHERE "pages" &gt; ?</sql>
+<cost value="310000"/>
+Read master map testapp.Book.IDKEY, looping on ID.
+</plan>
+</plans>
+"""
+
+
+def test_single_plan():
+    (plan,) = parse_plans(PLAN)
+    assert plan.sql == (
+        'SELECT "testapp_book"."id" FROM "testapp_book" '
+        'WHERE "testapp_book"."title" LIKE ?'
+    )
+    assert plan.cost == 1342.0
+    assert plan.maps == [
+        ("index map", "testapp.Book.TitleIdx"),
+        ("master map", "testapp.Book.IDKEY"),
+    ]
+    assert plan.indexes == ["testapp.Book.TitleIdx"]
+    assert plan.modules == []
+    assert not plan.parallel
+    # The plan text without the SQL, one stripped line each
+    assert plan.text.splitlines()[0].startswith("Read index map")
+    assert plan.text.splitlines()[-1] == "Output the row."
+
+
+def test_alternate_plans():
+    plans = parse_plans(ALT_PLANS)
+    assert [plan.cost for plan in plans] == [245000.0, 310000.0]
+    assert plans[0].modules == ["B"]
+    assert plans[0].maps == [
+        ("extent bitmap", "testapp.Book.%%DDLBEIndex"),
+        ("bitmap index map", "testapp.Book.PagesIdx"),
+        ("master map", "testapp.Book.IDKEY"),
+    ]
+    assert plans[0].indexes == ["testapp.Book.%%DDLBEIndex", "testapp.Book.PagesIdx"]
+    assert plans[0].parallel
+    assert plans[1].indexes == []
+    assert not plans[1].parallel
+
+
+@pytest.mark.parametrize("cost", ['<cost value="n/a"/>', "<cost/>", ""])
+def test_unknown_cost(cost):
+    (plan,) = parse_plans("<plan><sql>SELECT 1</sql>%s</plan>" % cost)
+    assert plan.cost is None
+
+
+@pytest.fixture
+def plan(stub):
+    # The XML may come back split over several rows
+    stub.respond(r"^EXPLAIN", [(PLAN[:40],), (PLAN[40:],)])
+    return stub
+
+
+@pytest.mark.parametrize(
+    "options, prefix",
+    [
+        ({}, "EXPLAIN SELECT"),
+        ({"alt": True}, "EXPLAIN ALT SELECT"),
+        ({"stat": True}, "EXPLAIN STAT SELECT"),
+        ({"alt": True, "stat": True}, "EXPLAIN ALT STAT SELECT"),
+        ({"alt": False}, "EXPLAIN SELECT"),
+    ],
+)
+def test_options(plan, options, prefix):
+    Book.objects.all().explain(**options)
+    ((sql, _),) = plan.statements()
+    assert sql.startswith(prefix + ' "testapp_book"')
+
+
+def test_unknown_options_are_rejected(plan):
+    with pytest.raises(ValueError, match="Unknown options: costs"):
+        Book.objects.all().explain(costs=True)
+
+
+def test_xml_format(plan):
+    assert Book.objects.all().explain() == PLAN
+    assert Book.objects.all().explain(format="xml") == PLAN
+
+
+def test_json_format(plan):
+    (result,) = json.loads(Book.objects.all().explain(format="json"))
+    assert result["cost"] == 1342.0
+    assert result["indexes"] == ["testapp.Book.TitleIdx"]
+    assert result["maps"][1] == {"kind": "master map", "name": "testapp.Book.IDKEY"}
+    assert result["parallel"] is False
+
+
+def test_text_format(plan):
+    assert Book.objects.all().explain(format="text") == parse_plans(PLAN)[0].text
+
+
+def test_explain(plan):
+    (parsed,) = explain(Book.objects.filter(title__startswith="A"), alt=True)
+    assert parsed.indexes == ["testapp.Book.TitleIdx"]
+    ((sql, params),) = plan.statements()
+    assert sql.startswith("EXPLAIN ALT SELECT")
+    assert params == ["A"]
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+import stub_dbapi
+
+
+@pytest.fixture
+def windowed(connection_with):
+    connection = connection_with(HEALTH_CHECK_WINDOW=30)
+    connection.ensure_connection()
+    connection.connection.log.clear()
+    return connection
+
+
+def probes(connection):
+    return [sql for sql, _ in connection.connection.statements() if sql == "SELECT 1"]
+
+
+def test_recent_io_skips_the_probe(windowed):
+    windowed._last_io = time.monotonic() - 10
+    assert windowed.is_usable()
+    assert probes(windowed) == []
+
+
+def test_queries_count_as_io(windowed):
+    windowed._last_io = 0.0
+    with windowed.cursor() as cursor:
+        cursor.execute("SELECT 2")
+    assert windowed.is_usable()
+    assert probes(windowed) == []
+
+
+def test_expired_window_probes_and_refreshes(windowed):
+    expired = time.monotonic() - 31
+    windowed._last_io = expired
+    assert windowed.is_usable()
+    assert probes(windowed) == ["SELECT 1"]
+    assert windowed._last_io > expired
+    # Within the window again
+    assert windowed.is_usable()
+    assert probes(windowed) == ["SELECT 1"]
+
+
+def test_failed_probe(windowed):
+    def fail(sql, params):
+        raise stub_dbapi.OperationalError("Communication link failure")
+
+    windowed.connection.respond(r"^SELECT 1$", fail)
+    windowed._last_io = expired = time.monotonic() - 31
+    assert not windowed.is_usable()
+    assert windowed._last_io == expired
+
+
+def test_no_window_always_probes(connection_with):
+    connection = connection_with(HEALTH_CHECK_WINDOW=0)
+    connection.ensure_connection()
+    connection._last_io = time.monotonic()
+    assert connection.is_usable()
+    assert connection.is_usable()
+    assert probes(connection) == ["SELECT 1", "SELECT 1"]
@@ -0,0 +1,63 @@
+import pytest
+from testapp.models import Book
+
+from django_iris.indexes import CollatedIndex
+
+
+def create_sql(connection, index):
+    """The statement, '%' is doubled until it's executed without params."""
+    with connection.schema_editor() as editor:
+        return str(index.create_sql(Book, editor))
+
+
+@pytest.mark.parametrize(
+    "collation, expected",
+    [
+        ("SQLUPPER", "SQLUPPER"),
+        ("exact", "EXACT"),
+        ("%SQLSTRING", "SQLSTRING"),
+    ],
+)
+def test_create_sql(connection, collation, expected):
+    index = CollatedIndex(
+        fields=["title", "subtitle"], name="book_title_idx", collation=collation
+    )
+    assert create_sql(connection, index) == (
+        'CREATE INDEX "book_title_idx" ON "testapp_book" '
+        '(%%%%%s("title"), %%%%%s("subtitle"))' % (expected, expected)
+    )
+
+
+def test_create_sql_uses_the_column(connection):
+    index = CollatedIndex(fields=["author"], name="book_author_idx", collation="EXACT")
+    assert create_sql(connection, index).endswith('(%%EXACT("author_id"))')
+
+
+def test_add_index(connection, stub):
+    with connection.schema_editor() as editor:
+        editor.add_index(Book, CollatedIndex(fields=["title"], name="book_title_idx"))
+    assert (
+        'CREATE INDEX "book_title_idx" ON "testapp_book" (%SQLUPPER("title"))',
+        [],
+    ) in stub.statements()
+
+
+def test_deconstruct():
+    index = CollatedIndex(fields=["title"], name="book_title_idx", collation="%exact")
+    path, args, kwargs = index.deconstruct()
+    assert path == "django_iris.indexes.CollatedIndex"
+    assert args == ()
+    assert kwargs == {
+        "fields": ["title"],
+        "name": "book_title_idx",
+        "collation": "EXACT",
+    }
+    assert CollatedIndex(*args, **kwargs) == index
+    assert index != CollatedIndex(fields=["title"], name="book_title_idx")
+
+
+def test_invalid():
+    with pytest.raises(ValueError, match="requires fields"):
+        CollatedIndex(name="book_title_idx")
+    with pytest.raises(ValueError, match="must be one of SQLUPPER, SQLSTRING"):
+        CollatedIndex(fields=["title"], name="book_title_idx", collation="TRUNCATE")
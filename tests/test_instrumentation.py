@@ -0,0 +1,85 @@
+import logging
+
+import pytest
+import stub_dbapi
+from django.db import DatabaseError
+
+from django_iris.instrumentation import QueryStats, fingerprint
+
+exported = []
+
+
+def sink(statistics):
+    exported.append(statistics)
+
+
+@pytest.fixture
+def instrumented(connection_with):
+    exported.clear()
+    connection = connection_with(
+        INSTRUMENTATION={
+            "SLOW_QUERY_THRESHOLD": 0.5,
+            "SINK": "test_instrumentation.sink",
+        }
+    )
+    connection.ensure_connection()
+    return connection
+
+
+def test_fingerprint_normalises_literals():
+    assert (
+        fingerprint("SELECT a FROM t WHERE b = 'x''y' AND c IN (?, ?, ?)  AND d > 10.5")
+        == "SELECT a FROM t WHERE b = ? AND c IN (...) AND d > ?"
+    )
+    assert fingerprint('SELECT "t1"."a" FROM "t1"') == 'SELECT "t1"."a" FROM "t1"'
+
+
+def test_statements_are_aggregated_by_fingerprint(instrumented):
+    instrumented.connection.respond(r"FROM t", [(1,), (2,), (3,)])
+    with instrumented.cursor() as cursor:
+        for value in (1, 2):
+            cursor.execute("SELECT a FROM t WHERE b = %d" % value)
+            cursor.fetchmany(2)
+            cursor.fetchmany(2)
+    (stats,) = instrumented.query_stats.snapshot().values()
+    assert stats["sql"] == "SELECT a FROM t WHERE b = ?"
+    assert stats["latency"]["count"] == 2
+    assert (stats["rows"], stats["fetches"]) == (6, 4)
+    assert stats["errors"] == 0
+
+
+def test_failed_statements_are_counted(instrumented):
+    def fail(sql, params):
+        raise stub_dbapi.ProgrammingError("SQLCODE: <-30>")
+
+    instrumented.connection.respond(r"FROM missing", fail)
+    with pytest.raises(DatabaseError), instrumented.cursor() as cursor:
+        cursor.execute("SELECT a FROM missing")
+    (stats,) = instrumented.query_stats.snapshot().values()
+    assert stats["errors"] == 1
+
+
+def test_sink_receives_statistics_on_close(instrumented):
+    with instrumented.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    instrumented.close()
+    assert len(exported) == 1
+    assert list(exported[0]) == ["SELECT ?"]
+    assert instrumented.query_stats.snapshot() == {}
+
+
+def test_slow_query_log(caplog):
+    stats = QueryStats(slow_query_threshold=0.5)
+    with caplog.at_level(logging.WARNING, logger="django.db.backends.iris"):
+        stats.record_execute("SELECT a FROM t WHERE b = ?", [1], 0.1)
+        stats.record_execute("SELECT a FROM t WHERE b = ?", [2], 0.7)
+    (record,) = caplog.records
+    assert record.sql == "SELECT a FROM t WHERE b = ?"
+    assert record.params == [2]
+    assert record.duration == 0.7
+    assert "Slow query (0.700)" in record.getMessage()
+
+
+def test_instrumentation_is_disabled_by_default(connection):
+    assert connection.query_stats is None
+    assert QueryStats.from_options(True).slow_query_threshold is None
@@ -0,0 +1,43 @@
+import pytest
+from testapp.models import Book
+
+
+def book_rows(count):
+    return [
+        (pk, "title %d" % pk, None, None, 0, None, None) for pk in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def fetch_size_50(connection_with):
+    connection = connection_with(FETCH_SIZE=50)
+    connection.ensure_connection()
+    stub = connection.connection
+    stub.respond(r'FROM "testapp_book"', book_rows(120))
+    return stub
+
+
+def fetches(stub):
+    return [size for kind, size, _ in stub.log if kind == "fetchmany"]
+
+
+def test_iterator_fetches_in_chunks(fetch_size_50):
+    books = Book.objects.iterator(chunk_size=50)
+    assert next(books).pk == 1
+    # Only the first chunk is held in memory
+    assert fetches(fetch_size_50) == [50]
+    assert [book.pk for book in books] == list(range(2, 121))
+    assert fetches(fetch_size_50) == [50, 50, 50, 50]
+
+
+def test_named_cursor_uses_fetch_size(fetch_size_50):
+    list(Book.objects.iterator(chunk_size=10))
+    cursor = fetch_size_50.cursors[-1]
+    assert cursor.arraysize == 50
+    assert set(fetches(fetch_size_50)) == {10}
+
+
+def test_larger_chunk_size_raises_driver_fetch_size(fetch_size_50):
+    list(Book.objects.iterator(chunk_size=500))
+    assert fetch_size_50.cursors[-1].arraysize == 500
+    assert fetches(fetch_size_50) == [500, 500]
@@ -0,0 +1,56 @@
+import pytest
+from django.db import NotSupportedError
+from testapp.models import Document
+
+
+def sql(queryset):
+    query, params = queryset.query.get_compiler("default").as_sql()
+    return query[query.index(" WHERE ") + 7 :], params
+
+
+def value(path):
+    return (
+        '(SELECT jt.val FROM JSON_TABLE("testapp_document"."data", \'$\' COLUMNS '
+        "(val VARCHAR(32768) PATH '%s')) jt)" % path
+    )
+
+
+@pytest.mark.parametrize(
+    "lookup, op", [("gt", ">"), ("gte", ">="), ("lt", "<"), ("lte", "<=")]
+)
+def test_numbers_compare_as_numbers(connection, lookup, op):
+    where, params = sql(Document.objects.filter(**{"data__n__%s" % lookup: 5}))
+    assert where == "CAST(%s AS DOUBLE) %s %%s" % (value('$."n"'), op)
+    assert params == (5,)
+
+
+def test_nested_key_with_float(connection):
+    where, params = sql(Document.objects.filter(data__a__b__lt=2.5))
+    assert where == "CAST(%s AS DOUBLE) < %%s" % value('$."a"."b"')
+    assert params == (2.5,)
+
+
+def test_strings_compare_as_strings(connection):
+    where, params = sql(Document.objects.filter(data__name__gte="m"))
+    assert where == "%s >= %%s" % value('$."name"')
+    assert params == ("m",)
+
+
+def test_flat_contains(connection):
+    where, params = sql(Document.objects.filter(data__contains={"a": 1, "b": "x"}))
+    assert where == "(%s = %%s AND %s = %%s)" % (value('$."a"'), value('$."b"'))
+    assert params == ("1", "x")
+
+
+@pytest.mark.parametrize(
+    "value", [{"a": {"b": 1}}, {"a": [1, 2]}, [1, 2], "a"], ids=repr
+)
+def test_unsupported_contains(connection, value):
+    queryset = Document.objects.filter(data__contains=value)
+    with pytest.raises(NotSupportedError):
+        sql(queryset)
+
+
+def test_contained_by(connection):
+    with pytest.raises(NotSupportedError):
+        sql(Document.objects.filter(data__contained_by={"a": 1}))
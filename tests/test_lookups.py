@@ -0,0 +1,81 @@
+import pytest
+from django.db.models import F
+from django.db.models.functions import Concat
+from testapp.models import Book
+
+TITLE = '"testapp_book"."title"'
+SUBTITLE = (
+    "REPLACE(REPLACE(REPLACE((\"testapp_book\".\"subtitle\"), '\\', '\\\\'), "
+    "'%', '\\%'), '_', '\\_')"
+)
+
+
+def where(stub, queryset):
+    """The WHERE clause and parameters sent to the driver."""
+    list(queryset)
+    sql, params = stub.statements()[-1]
+    return sql[sql.index(" WHERE ") + 7 : sql.index(" ORDER BY ")], params
+
+
+@pytest.mark.parametrize(
+    "lookup, pattern",
+    [
+        ("contains", "LIKE '%' || {} || '%'"),
+        ("icontains", "LIKE '%' || UPPER({}) || '%'"),
+        ("startswith", "LIKE {} || '%'"),
+        # %SQLUPPER() on the left adds a leading blank
+        ("istartswith", "LIKE ' ' || UPPER({}) || '%'"),
+        ("endswith", "LIKE '%' || {}"),
+        ("iendswith", "LIKE '%' || UPPER({})"),
+    ],
+)
+def test_pattern_with_expression(stub, lookup, pattern):
+    sql, params = where(
+        stub, Book.objects.filter(**{"title__" + lookup: F("subtitle")})
+    )
+    lhs = "%%SQLUPPER(%s)" % TITLE if lookup.startswith("i") else TITLE
+    assert sql == "%s %s" % (lhs, pattern.format(SUBTITLE))
+    assert params == []
+
+
+def test_pattern_with_concat(stub):
+    sql, _ = where(
+        stub, Book.objects.filter(title__iendswith=Concat(F("subtitle"), F("title")))
+    )
+    assert sql.startswith("%%SQLUPPER(%s) LIKE '%%' || UPPER(REPLACE(" % TITLE)
+    assert "SQLUPPER" not in sql[len("%SQLUPPER") :]
+
+
+def test_iexact_with_expression(stub):
+    # Both sides in %SQLUPPER(), the leading blanks match
+    sql, params = where(stub, Book.objects.filter(title__iexact=F("subtitle")))
+    assert sql == '%%SQLUPPER(%s) = %%SQLUPPER(("testapp_book"."subtitle"))' % TITLE
+    assert params == []
+
+
+@pytest.mark.parametrize(
+    "lookup, operator, value",
+    [
+        ("icontains", "LIKE %SQLUPPER(?) ESCAPE '\\'", "%a\\%b%"),
+        ("istartswith", "%STARTSWITH %SQLUPPER(?)", "a%b"),
+        ("iendswith", "LIKE %SQLUPPER(?) ESCAPE '\\'", "%a\\%b"),
+        ("iexact", "= %SQLUPPER(?)", "a%b"),
+    ],
+)
+def test_value_uses_sqlupper(stub, lookup, operator, value):
+    sql, params = where(stub, Book.objects.filter(**{"title__" + lookup: "a%b"}))
+    assert sql == "%%SQLUPPER(%s) %s" % (TITLE, operator)
+    assert params == [value]
+
+
+def test_istartswith_trailing_blanks_keep_them_in_a_pattern(stub):
+    # %SQLUPPER("foo ") is " FOO", the prefix of "foobar" as well
+    sql, params = where(stub, Book.objects.filter(title__istartswith="a%b "))
+    assert sql == "%%SQLUPPER(%s) LIKE %%SQLUPPER(?) ESCAPE '\\'" % TITLE
+    assert params == ["a\\%b %"]
+
+
+def test_startswith_trailing_blanks_are_a_prefix(stub):
+    sql, params = where(stub, Book.objects.filter(title__startswith="a "))
+    assert sql == "%s %%STARTSWITH ?" % TITLE
+    assert params == ["a "]
@@ -0,0 +1,162 @@
+import pytest
+from testapp.models import Book
+
+from django_iris.pagination import keyset_page
+
+COLUMNS = (
+    '"testapp_book"."id", "testapp_book"."title", "testapp_book"."subtitle", '
+    '"testapp_book"."author_id", "testapp_book"."pages", "testapp_book"."rating", '
+    '"testapp_book"."published"'
+)
+
+
+def seek(stub, queryset, after):
+    keyset_page(queryset, 10, after)
+    sql, params = stub.statements()[-1]
+    where = sql[sql.index(" WHERE ") + 7 : sql.index(" ORDER BY ")]
+    return where, params
+
+
+def test_first_page_has_no_predicate(stub):
+    keyset_page(Book.objects.order_by("title"), 10)
+    assert stub.statements()[-1] == (
+        'SELECT TOP 10 %s FROM "testapp_book" '
+        'ORDER BY "testapp_book"."title" ASC, "testapp_book"."id" ASC' % COLUMNS,
+        [],
+    )
+
+
+def test_mixed_directions(stub):
+    where, params = seek(
+        stub,
+        Book.objects.order_by("-pages", "title"),
+        {"pages": 3, "title": "b", "pk": 7},
+    )
+    assert where == (
+        '("testapp_book"."pages" < ? '
+        'OR ("testapp_book"."pages" = ? AND "testapp_book"."title" > ?) '
+        'OR ("testapp_book"."pages" = ? AND "testapp_book"."title" = ? '
+        'AND "testapp_book"."id" > ?))'
+    )
+    assert params == [3, 3, "b", 3, "b", 7]
+
+
+def test_nullable_columns(stub):
+    # NULLs sort last ascending, so they follow every rating and lead the
+    # descending publication dates
+    where, params = seek(
+        stub,
+        Book.objects.order_by("rating", "-published"),
+        {"rating": 4, "published": None, "pk": 7},
+    )
+    assert where == (
+        '("testapp_book"."rating" > ? OR "testapp_book"."rating" IS NULL '
+        'OR ("testapp_book"."rating" = ? AND "testapp_book"."published" IS NOT NULL) '
+        'OR ("testapp_book"."rating" = ? AND "testapp_book"."published" IS NULL '
+        'AND "testapp_book"."id" < ?))'
+    )
+    assert params == [4, 4, 4, 7]
+
+
+def test_after_null_ascending(stub):
+    where, params = seek(
+        stub, Book.objects.order_by("rating"), {"rating": None, "pk": 7}
+    )
+    assert where == '("testapp_book"."rating" IS NULL AND "testapp_book"."id" > ?)'
+    assert params == [7]
+
+
+def test_after_null_descending(stub):
+    where, params = seek(
+        stub, Book.objects.order_by("-rating"), {"rating": None, "pk": 7}
+    )
+    assert where == (
+        '("testapp_book"."rating" IS NOT NULL '
+        'OR ("testapp_book"."rating" IS NULL AND "testapp_book"."id" < ?))'
+    )
+    assert params == [7]
+
+
+def test_nullable_join(stub):
+    where, params = seek(
+        stub, Book.objects.order_by("author__name"), {"author__name": "x", "pk": 7}
+    )
+    assert where == (
+        '("testapp_author"."name" > ? OR "testapp_author"."name" IS NULL '
+        'OR ("testapp_author"."name" = ? AND "testapp_book"."id" > ?))'
+    )
+    assert params == ["x", "x", 7]
+
+
+def test_after_model_instance(stub):
+    book = Book(pk=7, title="b", pages=3)
+    where, params = seek(stub, Book.objects.order_by("pages"), book)
+    assert params == [3, 3, 7]
+
+
+@pytest.mark.parametrize("version, native", [("2025.1.0", True), ("2024.3", False)])
+def test_limit_offset_by_server_version(connection_with, version, native):
+    connection = connection_with(LIMIT_OFFSET=None)
+    connection.ensure_connection()
+    stub = connection.connection
+    stub.respond(r"\$ZVERSION", [("IRIS for UNIX (Ubuntu) %s (Build 1U)" % version,)])
+    assert connection.features.supports_limit_offset is native
+
+
+def test_native_limit_offset(connection_with):
+    connection = connection_with(LIMIT_OFFSET=True)
+    connection.ensure_connection()
+    list(Book.objects.all()[20:30])
+    sql, _ = connection.connection.statements()[-1]
+    assert sql == (
+        'SELECT %s FROM "testapp_book" ORDER BY "testapp_book"."id" ASC '
+        "LIMIT 10 OFFSET 20" % COLUMNS
+    )
+
+
+def test_row_number_paging(stub):
+    list(Book.objects.all()[20:30])
+    sql, _ = stub.statements()[-1]
+    assert "ROW_NUMBER()" in sql
+    assert "LIMIT" not in sql
+
+
+@pytest.fixture
+def parameterized(connection_with):
+    connection = connection_with(PARAMETERIZE_LIMITS=True)
+    connection.ensure_connection()
+    return connection.connection
+
+
+def last_statement(stub, queryset):
+    list(queryset)
+    return stub.statements()[-1]
+
+
+def test_pages_share_statement_text(parameterized):
+    books = Book.objects.order_by("id")
+    page2, params2 = last_statement(parameterized, books[10:20])
+    page3, params3 = last_statement(parameterized, books[20:30])
+    assert page2 == page3
+    assert page2.endswith("WHERE row_number between ? AND ? ORDER BY row_number")
+    assert (params2, params3) == ([11, 20], [21, 30])
+
+
+def test_first_pages_share_statement_text(parameterized):
+    books = Book.objects.order_by("id")
+    first, params = last_statement(parameterized, books[:10])
+    assert first == last_statement(parameterized, books[:20])[0]
+    assert first.startswith("SELECT TOP ? ")
+    assert params == [10]
+
+
+def test_open_ended_slice(parameterized):
+    sql, params = last_statement(parameterized, Book.objects.order_by("id")[10:])
+    assert sql.endswith("WHERE row_number >= ? ORDER BY row_number")
+    assert params == [11]
+
+
+def test_open_ended_slice_literal(stub):
+    sql, params = last_statement(stub, Book.objects.order_by("id")[10:])
+    assert sql.endswith("WHERE row_number >= 11 ORDER BY row_number")
+    assert params == []
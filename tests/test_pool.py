@@ -0,0 +1,212 @@
+import threading
+
+import pytest
+from django.db.utils import OperationalError
+
+from django_iris import pool as pool_module
+from django_iris.pool import ConnectionPool
+
+
+class Connection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(pool_module.time, "monotonic", clock)
+    return clock
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect():
+        created.append(Connection(len(created) + 1))
+        return created[-1]
+
+    pool = ConnectionPool(connect, **kwargs)
+    pool.created = created
+    return pool
+
+
+def test_connection_is_reused():
+    pool = make_pool()
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+    assert len(pool.created) == 1
+
+
+def test_min_size_is_opened_up_front():
+    pool = make_pool(min_size=3, max_size=5)
+    pool.open()
+    assert len(pool.created) == 3
+    stats = pool.get_stats()
+    assert (stats["pool_size"], stats["pool_available"]) == (3, 3)
+    # open() is idempotent
+    pool.open()
+    assert len(pool.created) == 3
+
+
+def test_checkout_timeout():
+    pool = make_pool(max_size=1, timeout=0.05)
+    pool.getconn()
+    with pytest.raises(OperationalError, match="after 0.05 seconds"):
+        pool.getconn()
+    assert pool.get_stats()["requests_timeouts"] == 1
+
+
+def test_waiting_request_gets_returned_connection():
+    pool = make_pool(max_size=1, timeout=5)
+    conn = pool.getconn()
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(pool.getconn()))
+    waiter.start()
+    while pool.get_stats()["requests_waiting"] != 1:
+        pass
+    pool.putconn(conn)
+    waiter.join()
+    assert result == [conn]
+    assert pool.get_stats()["requests_waiting"] == 0
+
+
+def test_max_lifetime(clock):
+    pool = make_pool(max_lifetime=60, max_idle=1000)
+    old = pool.getconn()
+    clock.now += 30
+    pool.putconn(old)
+    clock.now += 30
+    new = pool.getconn()
+    assert new is not old
+    assert old.closed
+
+
+def test_max_lifetime_on_return(clock):
+    pool = make_pool(max_lifetime=60)
+    conn = pool.getconn()
+    clock.now += 60
+    pool.putconn(conn)
+    assert conn.closed
+    assert pool.get_stats()["pool_size"] == 0
+
+
+def test_max_idle_above_min_size(clock):
+    pool = make_pool(min_size=1, max_size=3, max_idle=10)
+    first, second = pool.getconn(), pool.getconn()
+    pool.putconn(first)
+    pool.putconn(second)
+    clock.now += 10
+    # Above min_size, the idle connection is closed, the next one kept
+    conn = pool.getconn()
+    assert second.closed
+    assert conn is first
+    pool.putconn(conn)
+    clock.now += 10
+    assert pool.getconn() is first
+
+
+def test_failed_reset_closes_connection():
+    def reset(conn):
+        raise RuntimeError("connection lost")
+
+    pool = make_pool(reset=reset)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert conn.closed
+    assert pool.get_stats()["pool_available"] == 0
+    assert pool.getconn() is not conn
+
+
+def test_reset_runs_on_return():
+    reset = []
+    pool = make_pool(reset=reset.append)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert reset == [conn]
+    assert not conn.closed
+
+
+def test_foreign_connection():
+    pool = make_pool()
+    with pytest.raises(ValueError):
+        pool.putconn(Connection(0))
+
+
+def test_closed_pool():
+    pool = make_pool()
+    conn = pool.getconn()
+    idle = pool.getconn()
+    pool.putconn(idle)
+    pool.close()
+    assert idle.closed
+    with pytest.raises(OperationalError, match="closed"):
+        pool.getconn()
+    # Connections in use are closed when returned
+    pool.putconn(conn)
+    assert conn.closed
+
+
+def test_failed_connect_frees_its_slot():
+    attempts = []
+
+    def connect():
+        attempts.append(None)
+        raise OperationalError("refused")
+
+    pool = ConnectionPool(connect, max_size=1)
+    for _ in range(2):
+        with pytest.raises(OperationalError, match="refused"):
+            pool.getconn()
+    assert len(attempts) == 2
+    assert pool.get_stats()["pool_size"] == 0
+
+
+def test_stats(clock):
+    pool = make_pool(min_size=1, max_size=4, max_lifetime=60)
+    pool.open()
+    first = pool.getconn()
+    second = pool.getconn()
+    third = pool.getconn()
+    clock.now += 60
+    pool.putconn(third)
+    assert pool.get_stats() == {
+        "pool_min": 1,
+        "pool_max": 4,
+        "pool_size": 2,
+        "pool_available": 0,
+        "pool_in_use": 2,
+        "utilisation": 0.5,
+        "requests_waiting": 0,
+        "requests_num": 3,
+        "requests_wait_ms": 0.0,
+        "requests_wait_max_ms": 0.0,
+        "requests_timeouts": 0,
+        "connections_num": 3,
+        "connections_closed": 1,
+    }
+    # Past max_lifetime too
+    pool.putconn(first)
+    pool.putconn(second)
+    stats = pool.get_stats()
+    assert (stats["pool_size"], stats["connections_closed"]) == (0, 3)
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        ConnectionPool(lambda: None, min_size=3, max_size=2)
+    with pytest.raises(ValueError):
+        ConnectionPool(lambda: None, max_size=0)
@@ -0,0 +1,168 @@
+import pytest
+from django.core.management.sql import emit_post_migrate_signal, emit_pre_migrate_signal
+from django.db.models import Index
+from testapp.models import Book
+
+COLUMNS = [
+    ("testapp_author", "id", "integer", None, 10, 0, "NO", "YES", None),
+    ("testapp_book", "id", "integer", None, 10, 0, "NO", "YES", None),
+]
+
+
+@pytest.fixture
+def schema(stub):
+    stub.respond(r"FROM INFORMATION_SCHEMA\.COLUMNS", COLUMNS)
+    return stub
+
+
+def metadata_queries(stub):
+    """Parameters of the introspection queries, one for a schema-wide one."""
+    return [
+        params
+        for sql, params in stub.statements()
+        if "information_schema" in sql.lower() and "%ZDJANGO" not in sql
+    ]
+
+
+def introspect(editor, table):
+    with editor.connection.cursor() as cursor:
+        return editor.connection.introspection.get_constraints(cursor, table)
+
+
+def pre_migrate():
+    emit_pre_migrate_signal(0, False, "default", plan=[])
+
+
+def post_migrate():
+    emit_post_migrate_signal(0, False, "default", plan=[])
+
+
+def test_editor_outside_migrate_introspects_tables(connection, schema):
+    with connection.schema_editor() as editor:
+        introspect(editor, "testapp_book")
+    queries = metadata_queries(schema)
+    assert queries and all(params == ["SQLUser", "testapp_book"] for params in queries)
+    assert connection.introspection._schema_cache is None
+
+
+def test_migrate_run_loads_schema_once(connection, schema):
+    pre_migrate()
+    for table in ["testapp_book", "testapp_author"]:
+        with connection.schema_editor() as editor:
+            introspect(editor, table)
+    queries = metadata_queries(schema)
+    # One query per kind of metadata, for all migrations
+    assert len(queries) == 5
+    assert all(params == ["SQLUser"] for params in queries)
+    post_migrate()
+    assert connection.introspection._schema_cache is None
+    assert connection._migrate_schema_cache is None
+
+
+def test_altered_table_is_introspected_again(connection, schema):
+    pre_migrate()
+    with connection.schema_editor() as editor:
+        introspect(editor, "testapp_book")
+        editor.execute('ALTER TABLE "testapp_book" ADD "x" INTEGER')
+    with connection.schema_editor() as editor:
+        introspect(editor, "testapp_book")
+        introspect(editor, "testapp_author")
+    post_migrate()
+    queries = metadata_queries(schema)
+    assert queries[:5] == [["SQLUser"]] * 5
+    assert set(map(tuple, queries[5:])) == {("SQLUser", "testapp_book")}
+
+
+def test_failed_migration_ends_schema_cache(connection, schema):
+    pre_migrate()
+    with pytest.raises(ValueError):
+        with connection.schema_editor():
+            raise ValueError
+    assert connection._migrate_schema_cache is None
+    assert connection.introspection._schema_cache is None
+    assert connection._index_builds_after_migrate is False
+
+
+@pytest.fixture
+def deferred(connection_with):
+    connection = connection_with(DEFER_INDEX_BUILDS=True)
+    connection.ensure_connection()
+    stub = connection.connection
+    stub.respond(r"FROM INFORMATION_SCHEMA\.TABLES", [(1,)])
+    stub.respond(
+        r'FROM "SQLUser"\."django_iris_pending_index"',
+        [("testapp_book", "book_title_idx")],
+    )
+    stub.respond(r"FROM INFORMATION_SCHEMA\.INDEXES", [("book_title_idx",)])
+    return connection
+
+
+def add_index(connection):
+    with connection.schema_editor() as editor:
+        editor.add_index(Book, Index(fields=["title"], name="book_title_idx"))
+
+
+def builds(stub):
+    return [sql for sql, _ in stub.statements() if sql.startswith("BUILD INDEX")]
+
+
+def test_pending_table_is_schema_qualified(deferred):
+    stub = deferred.connection
+    stub.respond(r"FROM INFORMATION_SCHEMA\.TABLES", [(0,)])
+    add_index(deferred)
+    statements = stub.statements()
+    assert (
+        "SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES "
+        "WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?",
+        ["SQLUser", "django_iris_pending_index"],
+    ) in statements
+    assert [sql for sql, _ in statements if sql.startswith("CREATE TABLE")] == [
+        'CREATE TABLE "SQLUser"."django_iris_pending_index" '
+        "(table_name VARCHAR(255) NOT NULL, index_name VARCHAR(255) NOT NULL, "
+        "created TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    ]
+    assert (
+        'INSERT INTO "SQLUser"."django_iris_pending_index" (table_name, index_name) '
+        "VALUES (?, ?)",
+        ["testapp_book", "book_title_idx"],
+    ) in statements
+
+
+def test_indexes_are_built_at_post_migrate(deferred):
+    stub = deferred.connection
+    pre_migrate()
+    add_index(deferred)
+    assert builds(stub) == []
+    post_migrate()
+    assert builds(stub) == [
+        'BUILD INDEX FOR TABLE "testapp_book" INDEX "book_title_idx"'
+    ]
+    assert deferred._index_builds_after_migrate is False
+
+
+def test_failed_migrate_stops_deferring(deferred):
+    stub = deferred.connection
+    pre_migrate()
+    with pytest.raises(ValueError):
+        with deferred.schema_editor():
+            raise ValueError
+    assert deferred._index_builds_after_migrate is False
+    # Without post_migrate, the next schema editor builds its own indexes
+    add_index(deferred)
+    assert len(builds(stub)) == 1
+
+
+def test_pre_migrate_is_keyed_to_the_run(connection):
+    plan = []
+    emit_pre_migrate_signal(0, False, "default", plan=plan)
+    schema_cache = connection._migrate_schema_cache
+    # Sent again for another app of the same run
+    emit_pre_migrate_signal(0, False, "default", plan=plan)
+    assert connection._migrate_schema_cache is schema_cache
+    # A new run after one that never got its post_migrate
+    pre_migrate()
+    assert connection._migrate_schema_cache is not schema_cache
+    assert connection._index_builds_after_migrate is True
+    post_migrate()
+    assert connection._migrate_schema_cache is None
+    assert connection._migrate_run is None
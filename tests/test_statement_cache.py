@@ -0,0 +1,58 @@
+from django.db import connections
+
+from django_iris.utils import LRUCache
+
+
+def test_translated_statement_is_cached(connection, stub):
+    connection.statement_cache.clear()
+    before = connection.statement_cache.stats()
+    with connection.cursor() as cursor:
+        for value in range(3):
+            cursor.execute("SELECT %s FROM t WHERE a = %s", [value, value])
+    stats = connection.statement_cache.stats()
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["hits"] - before["hits"] == 2
+    assert stub.statements() == [
+        ("SELECT ? FROM t WHERE a = ?", [value, value]) for value in range(3)
+    ]
+
+
+def test_key_includes_params_count(connection, stub):
+    connection.statement_cache.clear()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 100%%")
+        cursor.execute("SELECT 100%% + %s", [1])
+    assert [sql for sql, _ in stub.statements()] == ["SELECT 100%", "SELECT 100% + ?"]
+    assert connection.statement_cache.stats()["size"] == 2
+
+
+def test_trailing_semicolon_is_removed(connection, stub):
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM t;")
+    assert stub.statements() == [("DELETE FROM t", [])]
+
+
+def test_least_recently_used_is_evicted(connection_with):
+    connection = connection_with(STATEMENT_CACHE_SIZE=2)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 2")
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 3")
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 2")
+    assert connection.statement_cache.stats() == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 2,
+        "misses": 4,
+        "evictions": 2,
+    }
+    assert connections["default"] is connection
+
+
+def test_zero_size_disables_cache():
+    cache = LRUCache(0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
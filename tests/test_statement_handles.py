@@ -0,0 +1,59 @@
+import pytest
+
+
+@pytest.fixture
+def handles_connection(connection_with):
+    connection = connection_with(PREPARED_STATEMENT_CACHE_SIZE=4)
+    connection.ensure_connection()
+    return connection
+
+
+def run(connection, sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        # Django's wrapper, the backend's, then the driver cursor
+        return cursor.cursor.cursor
+
+
+def test_same_statement_reuses_driver_cursor(handles_connection):
+    first = run(handles_connection, "SELECT a FROM t WHERE id = %s", [1])
+    second = run(handles_connection, "SELECT a FROM t WHERE id = %s", [2])
+    assert second is first
+    stats = handles_connection.statement_handles.stats()
+    assert (stats["prepares"], stats["executes"]) == (1, 2)
+
+
+def test_statements_keep_their_own_cursors(handles_connection):
+    a = run(handles_connection, "SELECT a FROM t")
+    b = run(handles_connection, "SELECT b FROM t")
+    assert b is not a
+    assert run(handles_connection, "SELECT a FROM t") is a
+    assert run(handles_connection, "SELECT b FROM t") is b
+    assert handles_connection.statement_handles.stats()["prepares"] == 2
+
+
+def test_ddl_invalidates_handles(handles_connection):
+    before = run(handles_connection, "SELECT a FROM t")
+    with handles_connection.schema_editor() as editor:
+        editor.execute("ALTER TABLE t ADD c INTEGER")
+    assert before.closed
+    after = run(handles_connection, "SELECT a FROM t")
+    assert after is not before
+    stats = handles_connection.statement_handles.stats()
+    assert stats["prepares"] == 3
+
+
+def test_reconnect_invalidates_handles(handles_connection):
+    before = run(handles_connection, "SELECT a FROM t")
+    handles_connection.close()
+    assert before.closed
+    after = run(handles_connection, "SELECT a FROM t")
+    assert after is not before
+
+
+def test_least_recently_used_handle_is_closed(connection_with):
+    connection = connection_with(PREPARED_STATEMENT_CACHE_SIZE=1)
+    a = run(connection, "SELECT a FROM t")
+    run(connection, "SELECT b FROM t")
+    assert a.closed
+    assert connection.statement_handles.stats()["evictions"] == 1
@@ -0,0 +1,136 @@
+import pytest
+from testapp.models import Attachment, LegacyAttachment
+
+from django_iris import streams
+
+
+@pytest.fixture(autouse=True)
+def not_installed(monkeypatch):
+    monkeypatch.setattr(streams, "_installed", set())
+
+
+def calls(stub, procedure):
+    return [
+        params
+        for sql, params in stub.statements()
+        if sql.startswith("CALL %%ZDJANGO.%s(" % procedure)
+    ]
+
+
+def created(stub):
+    return [sql for sql, _ in stub.statements() if sql.startswith("\nCREATE")]
+
+
+def test_names_are_sent_unquoted(stub):
+    streams.write_stream(Attachment(pk=3), "body", "abcdef", chunk_size=4)
+    assert calls(stub, "STREAM_APPEND") == [
+        [calls(stub, "STREAM_WRITE")[0][0], "abcd"],
+        [calls(stub, "STREAM_WRITE")[0][0], "ef"],
+    ]
+    assert calls(stub, "STREAM_WRITE")[0][1:] == [
+        "SQLUser",
+        "testapp_attachment",
+        "body",
+        "id",
+        3,
+        0,
+    ]
+
+
+def test_schema_and_quotes_in_names(stub):
+    streams.write_stream(LegacyAttachment(pk=1), "body", b"x")
+    assert calls(stub, "STREAM_WRITE")[0][1:5] == [
+        "Legacy",
+        "Attachment",
+        'bo"dy',
+        "id",
+    ]
+
+
+def test_binary(stub):
+    streams.write_stream(Attachment(pk=1), "data", b"x")
+    assert calls(stub, "STREAM_WRITE")[0][-1] == 1
+
+
+def test_procedure_validates_and_quotes_names():
+    write = streams.STREAM_PROCEDURES[1]
+    assert (
+        "INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?" in write
+    )
+    assert "$replace($list(names, i), q, q _ q)" in write
+    assert " _ tableName _ " not in write
+
+
+def test_procedures_are_created_once(connection_with, stub):
+    streams.write_stream(Attachment(pk=1), "body", "a")
+    streams.write_stream(Attachment(pk=2), "body", "b")
+    assert len(created(stub)) == 2
+    # Another connection to the same database
+    other = connection_with()
+    other.ensure_connection()
+    streams.write_stream(Attachment(pk=3), "body", "c")
+    assert created(other.connection) == []
+    assert len(calls(other.connection, "STREAM_WRITE")) == 1
+
+
+def test_procedures_per_database(connection_with):
+    streams.write_stream(Attachment(pk=1), "body", "a")
+    other = connection_with()
+    other.settings_dict["NAME"] = "OTHER"
+    other.ensure_connection()
+    streams.write_stream(Attachment(pk=2), "body", "b")
+    assert len(created(other.connection)) == 2
+
+
+@pytest.fixture
+def saved(stub):
+    # The stream column selects the primary key of the row
+    stub.respond(r'FROM "testapp_attachment"', [(1, 1, None)])
+    # Rows matched by an UPDATE
+    stub.respond(r'^UPDATE "testapp_attachment"', [(1,)])
+    stub.respond(
+        r"SUBSTRING\(", lambda sql, params: [("data",)] if params[0] == 1 else []
+    )
+    attachment = Attachment.objects.get(pk=1)
+    stub.log.clear()
+    return attachment
+
+
+def substring_reads(stub):
+    return [sql for sql, _ in stub.statements() if "SUBSTRING(" in sql]
+
+
+def test_update_leaves_unread_stream_alone(stub, saved):
+    assert isinstance(saved.body, streams.LazyStream)
+    saved.save()
+    assert substring_reads(stub) == []
+    [(sql, params)] = [s for s in stub.statements() if s[0].startswith("UPDATE")]
+    assert sql == (
+        'UPDATE "testapp_attachment" SET "body" = "testapp_attachment"."body", '
+        '"data" = NULL WHERE "testapp_attachment"."id" = ?'
+    )
+    assert params == [1]
+
+
+def test_update_writes_assigned_value(stub, saved):
+    saved.body = "new"
+    saved.save()
+    [(sql, params)] = [s for s in stub.statements() if s[0].startswith("UPDATE")]
+    assert sql.startswith('UPDATE "testapp_attachment" SET "body" = ?, "data" = NULL')
+    assert params == ["new", 1]
+
+
+def test_insert_writes_the_stream(stub, saved):
+    copy = Attachment(body=saved.body)
+    copy.save()
+    assert substring_reads(stub)
+    [(sql, params)] = [s for s in stub.statements() if s[0].startswith("INSERT")]
+    assert params == ["data", None]
+
+
+def test_stream_of_another_row_is_written(stub, saved):
+    other = Attachment(pk=2, body=saved.body)
+    other.save(force_update=True)
+    [(sql, params)] = [s for s in stub.statements() if s[0].startswith("UPDATE")]
+    assert substring_reads(stub)
+    assert params == ["data", 2]
@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    ExpressionWrapper,
+    OuterRef,
+    Q,
+    Subquery,
+)
+from testapp.models import Author, Book
+
+THREADS = 8
+ROUNDS = 25
+
+
+def querysets():
+    by_author = Book.objects.filter(author=OuterRef("pk"))
+    return [
+        # A condition in ORDER BY is wrapped in CASE WHEN, in WHERE it isn't
+        Book.objects.filter(pages__gt=100).order_by(
+            ExpressionWrapper(Q(rating__gte=4), output_field=BooleanField()).desc()
+        ),
+        Book.objects.annotate(
+            long=ExpressionWrapper(Q(pages__gt=300), output_field=BooleanField())
+        ).filter(title__startswith="A"),
+        Author.objects.filter(Exists(by_author.filter(rating__gt=3))).order_by(
+            ExpressionWrapper(
+                Exists(by_author.filter(pages__lt=50)), output_field=BooleanField()
+            )
+        ),
+        Author.objects.annotate(
+            latest=Subquery(by_author.order_by("-published").values("title")[:1]),
+            books=Count("book"),
+        ).filter(books__gt=1),
+        Book.objects.filter(
+            author__in=Author.objects.filter(
+                Exists(Book.objects.filter(author=OuterRef("pk"), pages__gt=10))
+            )
+        ).order_by("-pages")[5:15],
+    ]
+
+
+def compile_all():
+    return [queryset.query.get_compiler("default").as_sql() for queryset in querysets()]
+
+
+def test_concurrent_compilation_matches_serial(connection):
+    expected = compile_all()
+    start = threading.Barrier(THREADS)
+
+    def worker():
+        start.wait()
+        return [compile_all() for _ in range(ROUNDS)]
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = [
+            future.result() for future in [pool.submit(worker) for _ in range(THREADS)]
+        ]
+    for rounds in results:
+        for compiled in rounds:
+            assert compiled == expected
@@ -0,0 +1,63 @@
+import pytest
+from django.db.models import DateTimeField, Value
+from django.db.models.functions import Trunc
+from testapp.models import Book
+
+EPOCH = "'1900-01-01'"
+
+
+def whole_units(unit, sql):
+    return f"DATEADD({unit}, DATEDIFF({unit}, {EPOCH}, {sql}), {EPOCH})"
+
+
+def grouped_units(unit, size, sql):
+    units = f"DATEDIFF({unit}, {EPOCH}, {sql})"
+    return f"DATEADD({unit}, ({units} - ({units} # {size})), {EPOCH})"
+
+
+def expected(kind, sql):
+    if kind == "quarter":
+        return grouped_units("month", 3, sql), 2
+    if kind == "week":
+        return grouped_units("day", 7, sql), 2
+    if kind == "second":
+        day = whole_units("day", sql)
+        return f"DATEADD(second, DATEDIFF(second, {day}, {sql}), {day})", 3
+    return whole_units(kind, sql), 1
+
+
+@pytest.mark.parametrize("kind", ["year", "quarter", "month", "week", "day"])
+def test_date_trunc(connection, kind):
+    sql, params = connection.ops.date_trunc_sql(kind, "col", ("p",))
+    trunc, count = expected(kind, "CAST(col as DATE)")
+    assert sql == f"CAST({trunc} AS DATE)"
+    assert params == ("p",) * count
+
+
+@pytest.mark.parametrize(
+    "kind",
+    ["year", "quarter", "month", "week", "day", "hour", "minute", "second"],
+)
+def test_datetime_trunc(connection, kind):
+    sql, params = connection.ops.datetime_trunc_sql(kind, "col", ("p",))
+    trunc, count = expected(kind, "CAST(col as TIMESTAMP)")
+    assert sql == f"CAST({trunc} AS TIMESTAMP)"
+    assert params == ("p",) * count
+
+
+def test_trunc_without_params(connection):
+    sql, params = connection.ops.datetime_trunc_sql("hour", '"t"."c"', ())
+    assert sql == (
+        'CAST(DATEADD(hour, DATEDIFF(hour, \'1900-01-01\', CAST("t"."c" as TIMESTAMP)), '
+        "'1900-01-01') AS TIMESTAMP)"
+    )
+    assert params == ()
+
+
+def test_trunc_week_in_query(stub):
+    # The truncated expression appears twice, so does its parameter
+    value = Value("2024-06-05 10:30:00", output_field=DateTimeField())
+    list(Book.objects.annotate(week=Trunc(value, "week")).values_list("week"))
+    sql, params = stub.statements()[-1]
+    assert sql.count("CAST(? as TIMESTAMP)") == 2
+    assert params == ["2024-06-05 10:30:00"] * 2
@@ -0,0 +1,100 @@
+import pytest
+from django.db import DatabaseError, IntegrityError, NotSupportedError
+from testapp.models import Tag
+
+import stub_dbapi
+
+
+def tags(*slugs):
+    return [Tag(slug=slug, label=slug.title()) for slug in slugs]
+
+
+def test_update_conflicts_is_insert_or_update(stub):
+    Tag.objects.bulk_create(
+        tags("a", "b"), update_conflicts=True, update_fields=["label", "uses"]
+    )
+    assert stub.statements() == [
+        (
+            'INSERT OR UPDATE "testapp_tag" ("slug", "label", "uses") VALUES (?, ?, ?)',
+            [["a", "A", 0], ["b", "B", 0]],
+        )
+    ]
+
+
+def test_update_fields_must_cover_non_unique_columns(stub):
+    with pytest.raises(NotSupportedError, match="must include uses"):
+        Tag.objects.bulk_create(
+            tags("a"), update_conflicts=True, update_fields=["label"]
+        )
+    assert stub.statements() == []
+
+
+def test_unique_fields_are_not_supported(stub):
+    with pytest.raises(NotSupportedError):
+        Tag.objects.bulk_create(
+            tags("a"),
+            update_conflicts=True,
+            update_fields=["label", "uses"],
+            unique_fields=["slug"],
+        )
+
+
+def failing_on(slug, error):
+    def respond(sql, params):
+        if params[0] == slug:
+            raise error
+        return []
+
+    return respond
+
+
+def test_ignore_conflicts_skips_uniqueness_violations(stub):
+    stub.respond(
+        r"^INSERT",
+        failing_on(
+            "b", stub_dbapi.IntegrityError("[SQLCODE: <-119>:<UNIQUE or PRIMARY KEY>]")
+        ),
+    )
+    Tag.objects.bulk_create(tags("a", "b", "c"), ignore_conflicts=True)
+    statements = stub.statements()
+    # One statement per row, executemany() would stop at the failing one
+    assert [params[0] for _, params in statements] == ["a", "b", "c"]
+    assert {sql for sql, _ in statements} == {
+        'INSERT INTO "testapp_tag" ("slug", "label", "uses") VALUES (?, ?, ?)'
+    }
+
+
+def test_ignore_conflicts_raises_other_errors(stub):
+    stub.respond(
+        r"^INSERT",
+        failing_on(
+            "b", stub_dbapi.DataError("[SQLCODE: <-104>:<Field validation failed>]")
+        ),
+    )
+    with pytest.raises(DatabaseError, match="-104"):
+        Tag.objects.bulk_create(tags("a", "b", "c"), ignore_conflicts=True)
+    assert [params[0] for _, params in stub.statements()] == ["a", "b"]
+
+
+def test_conflicts_are_raised_without_ignore_conflicts(stub):
+    stub.respond(
+        r"^INSERT",
+        failing_on("b", stub_dbapi.IntegrityError("[SQLCODE: <-119>:<UNIQUE>]")),
+    )
+    with pytest.raises(IntegrityError):
+        Tag.objects.bulk_create(tags("b"))
+
+
+def test_nocheck_while_constraint_checking_is_disabled(connection, stub):
+    with connection.constraint_checks_disabled():
+        Tag.objects.bulk_create(tags("a", "b"))
+        Tag.objects.bulk_create(tags("c"), ignore_conflicts=True)
+        Tag.objects.bulk_create(
+            tags("d"), update_conflicts=True, update_fields=["label", "uses"]
+        )
+    assert [sql.split(' "testapp_tag"')[0] for sql, _ in stub.statements()] == [
+        "INSERT %NOCHECK INTO",
+        # Conflicts are found by the uniqueness checks %NOCHECK skips
+        "INSERT INTO",
+        "INSERT OR UPDATE",
+    ]
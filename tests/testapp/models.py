@@ -0,0 +1,52 @@
+from django.db import models
+
+from django_iris.bulk import BulkUpdateQuerySetMixin
+from django_iris.streams import LazyBinaryField, LazyTextField
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=100)
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=200)
+    subtitle = models.CharField(max_length=200, null=True)
+    author = models.ForeignKey(Author, models.CASCADE, null=True)
+    pages = models.IntegerField(default=0)
+    rating = models.IntegerField(null=True)
+    published = models.DateTimeField(null=True)
+
+    class Meta:
+        ordering = ["id"]
+
+
+class NovelQuerySet(BulkUpdateQuerySetMixin, models.QuerySet):
+    pass
+
+
+class Novel(Book):
+    genre = models.CharField(max_length=50)
+
+    objects = NovelQuerySet.as_manager()
+
+
+class Document(models.Model):
+    data = models.JSONField(null=True)
+
+
+class Attachment(models.Model):
+    body = LazyTextField(null=True)
+    data = LazyBinaryField(null=True)
+
+
+class LegacyAttachment(models.Model):
+    body = LazyTextField(db_column='bo"dy', null=True)
+
+    class Meta:
+        db_table = "Legacy.Attachment"
+
+
+class Tag(models.Model):
+    slug = models.CharField(max_length=50, unique=True)
+    label = models.CharField(max_length=100)
+    uses = models.IntegerField(default=0)